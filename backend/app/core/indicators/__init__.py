@@ -1,4 +1,4 @@
-from .utils import rolling_normalize
+from .utils import rolling_normalize, rolling_normalize_frame, run_bounds, longest_run
 
 from .returns import (
     calculate_simple_returns,
@@ -11,6 +11,7 @@ from .returns import (
     calculate_ytd_return,
     calculate_mtd_return,
     calculate_rolling_return,
+    calculate_rolling_return_multi,
     calculate_realized_pnl,
     calculate_unrealized_pnl,
     calculate_total_pnl,
@@ -29,6 +30,7 @@ from .risk import (
 )
 
 from .drawdown import (
+    calculate_running_peak,
     calculate_drawdown_series,
     calculate_max_drawdown,
     calculate_drawdown_duration,
@@ -44,10 +46,13 @@ from .drawdown import (
 from .ratios import (
     calculate_sharpe_ratio,
     calculate_rolling_sharpe,
+    calculate_rolling_sharpe_multi,
     calculate_sortino_ratio,
     calculate_calmar_ratio,
     calculate_treynor_ratio,
     calculate_omega_ratio,
+    calculate_return_split,
+    ReturnSplit,
     calculate_m2_measure,
     calculate_gain_to_pain_ratio,
     calculate_ulcer_performance_index
@@ -208,6 +213,9 @@ def calculate_risk_contribution(weights, price_history):
 
 __all__ = [
     'rolling_normalize',
+    'rolling_normalize_frame',
+    'run_bounds',
+    'longest_run',
     'calculate_simple_returns',
     'calculate_log_returns',
     'calculate_cumulative_returns',
@@ -218,6 +226,7 @@ __all__ = [
     'calculate_ytd_return',
     'calculate_mtd_return',
     'calculate_rolling_return',
+    'calculate_rolling_return_multi',
     'calculate_realized_pnl',
     'calculate_unrealized_pnl',
     'calculate_total_pnl',
@@ -230,6 +239,7 @@ __all__ = [
     'calculate_upside_volatility',
     'calculate_downside_volatility',
     'calculate_semivariance',
+    'calculate_running_peak',
     'calculate_drawdown_series',
     'calculate_max_drawdown',
     'calculate_drawdown_duration',
@@ -242,10 +252,13 @@ __all__ = [
     'calculate_ulcer_index',
     'calculate_sharpe_ratio',
     'calculate_rolling_sharpe',
+    'calculate_rolling_sharpe_multi',
     'calculate_sortino_ratio',
     'calculate_calmar_ratio',
     'calculate_treynor_ratio',
     'calculate_omega_ratio',
+    'calculate_return_split',
+    'ReturnSplit',
     'calculate_m2_measure',
     'calculate_gain_to_pain_ratio',
     'calculate_ulcer_performance_index',
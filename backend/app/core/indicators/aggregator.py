@@ -144,27 +144,29 @@ def calculate_all_portfolio_indicators(
     result['risk']['rolling_volatility_30d'] = float(rolling_vol_30d.iloc[-1]) if not rolling_vol_30d.empty and len(rolling_vol_30d) > 0 else 0.0
 
     result['drawdown'] = {}
-    result['drawdown']['max_drawdown'] = drawdown_module.calculate_max_drawdown(nav)
-    result['drawdown']['avg_drawdown'] = drawdown_module.calculate_avg_drawdown(nav)
+    peaks = drawdown_module.calculate_running_peak(nav)
+    result['drawdown']['max_drawdown'] = drawdown_module.calculate_max_drawdown(nav, peaks)
+    result['drawdown']['avg_drawdown'] = drawdown_module.calculate_avg_drawdown(nav, peaks)
     result['drawdown']['max_daily_loss'] = drawdown_module.calculate_max_daily_loss(returns)
     result['drawdown']['max_daily_gain'] = drawdown_module.calculate_max_daily_gain(returns)
     result['drawdown']['consecutive_loss_days'] = drawdown_module.calculate_consecutive_loss_days(returns)
     result['drawdown']['consecutive_gain_days'] = drawdown_module.calculate_consecutive_gain_days(returns)
 
-    dd_duration = drawdown_module.calculate_drawdown_duration(nav)
+    dd_duration = drawdown_module.calculate_drawdown_duration(nav, peaks)
     result['drawdown'].update(dd_duration)
 
-    recovery_info = drawdown_module.calculate_recovery_time(nav)
+    recovery_info = drawdown_module.calculate_recovery_time(nav, peaks)
     result['drawdown'].update(recovery_info)
 
-    result['drawdown']['ulcer_index'] = drawdown_module.calculate_ulcer_index(nav)
+    result['drawdown']['ulcer_index'] = drawdown_module.calculate_ulcer_index(nav, peaks=peaks)
 
     result['risk_adjusted_ratios'] = {}
     result['risk_adjusted_ratios']['sharpe'] = ratios_module.calculate_sharpe_ratio(returns)
     result['risk_adjusted_ratios']['sortino'] = ratios_module.calculate_sortino_ratio(returns)
     result['risk_adjusted_ratios']['calmar'] = ratios_module.calculate_calmar_ratio(nav, returns)
-    result['risk_adjusted_ratios']['omega'] = ratios_module.calculate_omega_ratio(returns)
-    result['risk_adjusted_ratios']['gain_to_pain'] = ratios_module.calculate_gain_to_pain_ratio(returns)
+    split = ratios_module.calculate_return_split(returns)
+    result['risk_adjusted_ratios']['omega'] = ratios_module.calculate_omega_ratio(returns, split=split)
+    result['risk_adjusted_ratios']['gain_to_pain'] = ratios_module.calculate_gain_to_pain_ratio(returns, split=split)
     result['risk_adjusted_ratios']['ulcer_performance_index'] = ratios_module.calculate_ulcer_performance_index(nav, returns)
 
     rolling_sharpe_30d = ratios_module.calculate_rolling_sharpe(returns, window=30)
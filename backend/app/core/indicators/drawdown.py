@@ -1,67 +1,74 @@
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+from .utils import longest_run, run_bounds
 
-def calculate_drawdown_series(nav: pd.Series) -> pd.Series:
+def _float_values(series: pd.Series) -> np.ndarray:
+    """Series values as a float64 ndarray"""
+    return series.to_numpy(dtype=np.float64)
+
+def calculate_running_peak(nav: pd.Series) -> np.ndarray:
+    """Calculate running maximum of NAV (NaN-skipping, like expanding().max())
+
+    Compute once and pass as ``peaks=`` to share it across the drawdown metrics
+    of the same ``nav``.
+    """
+    return np.fmax.accumulate(_float_values(nav))
+
+def calculate_drawdown_series(nav: pd.Series, peaks: Optional[np.ndarray] = None) -> pd.Series:
     """Calculate daily drawdown series from NAV"""
     if nav.empty:
         return pd.Series()
 
-    running_max = nav.expanding().max()
-    drawdown = (nav - running_max) / running_max
+    if peaks is None:
+        peaks = calculate_running_peak(nav)
+    drawdown = (nav - peaks) / peaks
     return drawdown
 
-def calculate_max_drawdown(nav: pd.Series) -> float:
+def calculate_max_drawdown(nav: pd.Series, peaks: Optional[np.ndarray] = None) -> float:
     """Calculate maximum drawdown"""
     if nav.empty:
         return 0.0
 
-    drawdown = calculate_drawdown_series(nav)
-    return float(drawdown.min())
+    if peaks is None:
+        peaks = calculate_running_peak(nav)
+    drawdown = (_float_values(nav) - peaks) / peaks
+    return float(np.fmin.reduce(drawdown))
 
-def calculate_drawdown_duration(nav: pd.Series) -> Dict[str, float]:
+def calculate_drawdown_duration(nav: pd.Series, peaks: Optional[np.ndarray] = None) -> Dict[str, float]:
     """Calculate drawdown duration metrics"""
     if nav.empty:
         return {}
 
-    running_max = nav.expanding().max()
-    drawdown = (nav - running_max) / running_max
+    drawdown = calculate_drawdown_series(nav, peaks).to_numpy()
 
     in_drawdown = drawdown < 0
-    drawdown_periods = []
-    current_duration = 0
-    max_duration = 0
-    max_dd_duration = 0
-    max_dd_value = 0
-
-    for i, is_dd in enumerate(in_drawdown):
-        if is_dd:
-            current_duration += 1
-            max_duration = max(max_duration, current_duration)
-
-            if drawdown.iloc[i] < max_dd_value:
-                max_dd_value = drawdown.iloc[i]
-                max_dd_duration = current_duration
-        else:
-            if current_duration > 0:
-                drawdown_periods.append(current_duration)
-            current_duration = 0
-
-    if current_duration > 0:
-        drawdown_periods.append(current_duration)
+    if not in_drawdown.any():
+        return {
+            'max_drawdown_duration': 0.0,
+            'longest_drawdown_period': 0.0,
+            'avg_drawdown_duration': 0.0
+        }
+
+    starts, lengths = run_bounds(in_drawdown)
+
+    # Days into its drawdown period at which the deepest point was first reached
+    trough = int(np.nanargmin(drawdown))
+    trough_start = starts[np.searchsorted(starts, trough, side='right') - 1]
+    max_dd_duration = trough - trough_start + 1
 
     return {
         'max_drawdown_duration': float(max_dd_duration),
-        'longest_drawdown_period': float(max_duration),
-        'avg_drawdown_duration': float(np.mean(drawdown_periods)) if drawdown_periods else 0.0
+        'longest_drawdown_period': float(lengths.max()),
+        'avg_drawdown_duration': float(lengths.mean())
     }
 
-def calculate_avg_drawdown(nav: pd.Series) -> float:
+def calculate_avg_drawdown(nav: pd.Series, peaks: Optional[np.ndarray] = None) -> float:
     """Calculate average drawdown depth"""
     if nav.empty:
         return 0.0
 
-    drawdown = calculate_drawdown_series(nav)
+    drawdown = calculate_drawdown_series(nav, peaks)
     drawdown_values = drawdown[drawdown < 0]
 
     if drawdown_values.empty:
@@ -69,36 +76,30 @@ def calculate_avg_drawdown(nav: pd.Series) -> float:
 
     return float(drawdown_values.mean())
 
-def calculate_recovery_time(nav: pd.Series) -> Dict[str, float]:
+def calculate_recovery_time(nav: pd.Series, peaks: Optional[np.ndarray] = None) -> Dict[str, float]:
     """Calculate recovery time from trough to previous peak"""
     if nav.empty or len(nav) < 2:
         return {}
 
-    running_max = nav.expanding().max()
-    drawdown = (nav - running_max) / running_max
+    values = _float_values(nav)
+    if peaks is None:
+        peaks = calculate_running_peak(nav)
+    drawdown = (values - peaks) / peaks
 
-    trough_idx = drawdown.idxmin()
-    trough_value = drawdown.min()
-
-    if trough_value == 0:
+    trough = int(np.nanargmin(drawdown))
+    if drawdown[trough] == 0:
         return {'recovery_days': 0.0}
 
-    recovery_nav = nav[nav.index > trough_idx]
-    peak_value = running_max[trough_idx]
-
-    recovery_idx = None
-    for idx, value in recovery_nav.items():
-        if value >= peak_value:
-            recovery_idx = idx
-            break
-
-    if recovery_idx is None:
+    # First position after the trough that regains the pre-trough peak
+    recovered = values[trough + 1:] >= peaks[trough]
+    if not recovered.any():
         return {
             'recovery_days': float('inf'),
             'recovered': False
         }
 
-    recovery_days = (recovery_idx - trough_idx).days
+    recovery = trough + 1 + int(recovered.argmax())
+    recovery_days = (nav.index[recovery] - nav.index[trough]).days
 
     return {
         'recovery_days': float(recovery_days),
@@ -122,43 +123,22 @@ def calculate_consecutive_loss_days(returns: pd.Series) -> int:
     if returns.empty:
         return 0
 
-    is_loss = returns < 0
-    consecutive = 0
-    max_consecutive = 0
-
-    for loss in is_loss:
-        if loss:
-            consecutive += 1
-            max_consecutive = max(max_consecutive, consecutive)
-        else:
-            consecutive = 0
-
-    return int(max_consecutive)
+    return longest_run(returns.to_numpy() < 0)
 
 def calculate_consecutive_gain_days(returns: pd.Series) -> int:
     """Calculate maximum consecutive gaining days"""
     if returns.empty:
         return 0
 
-    is_gain = returns > 0
-    consecutive = 0
-    max_consecutive = 0
-
-    for gain in is_gain:
-        if gain:
-            consecutive += 1
-            max_consecutive = max(max_consecutive, consecutive)
-        else:
-            consecutive = 0
+    return longest_run(returns.to_numpy() > 0)
 
-    return int(max_consecutive)
-
-def calculate_ulcer_index(nav: pd.Series, window: int = 14) -> float:
+def calculate_ulcer_index(nav: pd.Series, window: int = 14, peaks: Optional[np.ndarray] = None) -> float:
     """Calculate Ulcer Index - measures downside risk considering depth and duration
 
     Args:
         nav: NAV time series
         window: Lookback period in days (default 14)
+        peaks: Precomputed ``calculate_running_peak(nav)``
 
     Returns:
         Ulcer Index (lower is better, measures downside volatility)
@@ -166,8 +146,13 @@ def calculate_ulcer_index(nav: pd.Series, window: int = 14) -> float:
     if nav.empty or len(nav) < window:
         return 0.0
 
-    drawdown_pct = calculate_drawdown_series(nav) * 100
-    squared_drawdowns = drawdown_pct ** 2
-    ulcer = np.sqrt(squared_drawdowns.rolling(window=window).mean().iloc[-1])
+    if peaks is None:
+        peaks = calculate_running_peak(nav)
+
+    # Only the trailing window is reported, so skip the full rolling pass
+    tail_nav = _float_values(nav)[-window:]
+    tail_peaks = peaks[-window:]
+    drawdown_pct = (tail_nav - tail_peaks) / tail_peaks * 100
+    ulcer = np.sqrt(np.mean(drawdown_pct * drawdown_pct))
 
     return float(ulcer) if not np.isnan(ulcer) else 0.0
@@ -1,9 +1,32 @@
 import pandas as pd
 import numpy as np
-from .risk import calculate_annualized_volatility, calculate_downside_volatility
+from typing import Dict, Iterable, NamedTuple, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from .risk import calculate_annualized_volatility, calculate_downside_volatility, SQRT_252
 from .returns import calculate_annualized_return
 from .drawdown import calculate_max_drawdown
 
+class ReturnSplit(NamedTuple):
+    """Excess returns above and below the threshold they were split at"""
+    upside: np.ndarray
+    downside: np.ndarray
+    threshold: float
+
+def calculate_return_split(returns: pd.Series, threshold: float = 0.0) -> ReturnSplit:
+    """Split excess returns over threshold into their positive and negative parts
+
+    Compute once and pass as ``split=`` to share it between Omega and
+    gain-to-pain. Gain-to-pain is defined at zero, so it only accepts a split
+    taken at ``threshold=0.0``.
+    """
+    excess = returns.to_numpy() - threshold
+    return ReturnSplit(excess[excess > 0], excess[excess < 0], threshold)
+
+def _check_split(split: ReturnSplit, threshold: float) -> None:
+    """Raise if a precomputed split was taken at a different threshold"""
+    if split.threshold != threshold:
+        raise ValueError(f"split was taken at threshold {split.threshold}, expected {threshold}")
+
 def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.0) -> float:
     """Calculate Sharpe Ratio = (annual_return - rf) / annual_volatility"""
     if returns.empty:
@@ -18,25 +41,48 @@ def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.0) -> f
     sharpe = (annual_return - risk_free_rate) / annual_vol
     return float(sharpe)
 
+def _rolling_sharpe_values(values: np.ndarray, window: int, risk_free_rate: float) -> np.ndarray:
+    """Rolling annualized Sharpe over full windows of a float64 array (NaN before the first)"""
+    result = np.full(values.shape[0], np.nan)
+    if window < 10 or values.shape[0] < window:
+        return result
+
+    windows = sliding_window_view(values, window)
+    mean_ret = windows.mean(axis=1) * 252
+    std_ret = windows.std(axis=1, ddof=1) * SQRT_252
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean_ret - risk_free_rate) / std_ret
+    sharpe[std_ret == 0] = 0.0
+
+    result[window - 1:] = sharpe
+    return result
+
 def calculate_rolling_sharpe(returns: pd.Series, window: int = 252, risk_free_rate: float = 0.0) -> pd.Series:
     """Calculate rolling Sharpe ratio"""
     if returns.empty:
         return pd.Series()
 
-    def sharpe_window(window_returns: pd.Series) -> float:
-        if len(window_returns) < 10:
-            return np.nan
-
-        mean_ret = window_returns.mean() * 252
-        std_ret = window_returns.std() * np.sqrt(252)
+    values = returns.to_numpy(dtype=np.float64)
+    return pd.Series(_rolling_sharpe_values(values, window, risk_free_rate),
+                     index=returns.index, name=returns.name)
 
-        if std_ret == 0:
-            return 0.0
+def calculate_rolling_sharpe_multi(returns: pd.Series, windows: Iterable[int],
+                                   risk_free_rate: float = 0.0) -> Dict[int, pd.Series]:
+    """Calculate rolling Sharpe ratio for several windows in one call
 
-        return (mean_ret - risk_free_rate) / std_ret
+    Returns:
+        Dict of {window: rolling Sharpe series}
+    """
+    if returns.empty:
+        return {window: pd.Series() for window in windows}
 
-    rolling_sharpe = returns.rolling(window=window).apply(sharpe_window, raw=False)
-    return rolling_sharpe
+    values = returns.to_numpy(dtype=np.float64)
+    return {
+        window: pd.Series(_rolling_sharpe_values(values, window, risk_free_rate),
+                          index=returns.index, name=returns.name)
+        for window in windows
+    }
 
 def calculate_sortino_ratio(returns: pd.Series, target_return: float = 0.0, risk_free_rate: float = 0.0) -> float:
     """Calculate Sortino Ratio = (annual_return - rf) / downside_volatility"""
@@ -84,12 +130,14 @@ def calculate_treynor_ratio(returns: pd.Series, beta: float, risk_free_rate: flo
     treynor = (annual_return - risk_free_rate) / beta
     return float(treynor)
 
-def calculate_omega_ratio(returns: pd.Series, threshold: float = 0.0) -> float:
+def calculate_omega_ratio(returns: pd.Series, threshold: float = 0.0,
+                          split: Optional[ReturnSplit] = None) -> float:
     """Calculate Omega Ratio = probability weighted gains / probability weighted losses
 
     Args:
         returns: Daily returns series
         threshold: Minimum acceptable return (default 0.0)
+        split: Precomputed ``calculate_return_split(returns, threshold)``
 
     Returns:
         Omega ratio (>1 indicates good risk-adjusted performance)
@@ -97,9 +145,12 @@ def calculate_omega_ratio(returns: pd.Series, threshold: float = 0.0) -> float:
     if returns.empty:
         return 0.0
 
-    excess_returns = returns - threshold
-    gains = excess_returns[excess_returns > 0].sum()
-    losses = -excess_returns[excess_returns < 0].sum()
+    if split is None:
+        split = calculate_return_split(returns, threshold)
+    else:
+        _check_split(split, threshold)
+    gains = split.upside.sum()
+    losses = -split.downside.sum()
 
     if losses == 0:
         return float('inf') if gains > 0 else 0.0
@@ -137,11 +188,13 @@ def calculate_m2_measure(returns: pd.Series, benchmark_returns: pd.Series, risk_
 
     return float(m2)
 
-def calculate_gain_to_pain_ratio(returns: pd.Series) -> float:
+def calculate_gain_to_pain_ratio(returns: pd.Series,
+                                 split: Optional[ReturnSplit] = None) -> float:
     """Calculate Gain-to-Pain Ratio = sum(positive returns) / abs(sum(negative returns))
 
     Args:
         returns: Daily returns series
+        split: Precomputed ``calculate_return_split(returns)`` (threshold 0.0)
 
     Returns:
         Gain-to-pain ratio (higher is better)
@@ -149,8 +202,12 @@ def calculate_gain_to_pain_ratio(returns: pd.Series) -> float:
     if returns.empty:
         return 0.0
 
-    gains = returns[returns > 0].sum()
-    pains = abs(returns[returns < 0].sum())
+    if split is None:
+        split = calculate_return_split(returns)
+    else:
+        _check_split(split, 0.0)
+    gains = split.upside.sum()
+    pains = abs(split.downside.sum())
 
     if pains == 0:
         return float('inf') if gains > 0 else 0.0
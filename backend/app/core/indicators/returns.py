@@ -1,7 +1,9 @@
 import pandas as pd
 import numpy as np
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Union
+from numpy.lib.stride_tricks import sliding_window_view
 
 def calculate_simple_returns(prices: pd.Series) -> pd.Series:
     """Calculate daily simple returns: r_t = P_t / P_{t-1} - 1"""
@@ -80,9 +82,39 @@ def calculate_mtd_return(nav: pd.Series) -> float:
 
     return float(mtd_nav.iloc[-1] / mtd_nav.iloc[0] - 1)
 
-def calculate_rolling_return(returns: pd.Series, window: int) -> pd.Series:
-    """Calculate N-day rolling returns"""
-    return (1 + returns).rolling(window=window).apply(lambda x: x.prod() - 1, raw=True)
+def _rolling_return_values(growth: np.ndarray, window: int) -> np.ndarray:
+    """Compounded return over each full window of a float64 growth (1 + r) array"""
+    result = np.full(growth.shape[0], np.nan)
+    if window < 1 or growth.shape[0] < window:
+        return result
+
+    result[window - 1:] = sliding_window_view(growth, window).prod(axis=1) - 1
+    return result
+
+def _rolling_return_series(returns: pd.Series, growth: np.ndarray, window) -> pd.Series:
+    """Rolling compounded return; offset windows such as '30D' go through pandas"""
+    if not isinstance(window, (int, np.integer)):
+        return (1 + returns).rolling(window=window).apply(lambda x: x.prod() - 1, raw=True)
+    return pd.Series(_rolling_return_values(growth, window), index=returns.index, name=returns.name)
+
+def calculate_rolling_return(returns: pd.Series, window: Union[int, str]) -> pd.Series:
+    """Calculate N-day rolling returns
+
+    An integer window counts observations; an offset string such as '30D'
+    needs a DatetimeIndex and is handled by pandas rolling.
+    """
+    growth = (1 + returns).to_numpy(dtype=np.float64)
+    return _rolling_return_series(returns, growth, window)
+
+def calculate_rolling_return_multi(returns: pd.Series,
+                                   windows: Iterable[Union[int, str]]) -> Dict[Union[int, str], pd.Series]:
+    """Calculate N-day rolling returns for several windows in one call
+
+    Returns:
+        Dict of {window: rolling return series}
+    """
+    growth = (1 + returns).to_numpy(dtype=np.float64)
+    return {window: _rolling_return_series(returns, growth, window) for window in windows}
 
 def calculate_realized_pnl(transactions: pd.DataFrame) -> float:
     """Calculate realized P&L from completed trades"""
@@ -150,28 +182,29 @@ def calculate_trade_pnl(transactions: pd.DataFrame) -> pd.DataFrame:
     trades = []
     positions = {}
 
-    for _, txn in transactions.iterrows():
-        symbol = txn['symbol']
-        side = txn['side'].upper()
-        qty = float(txn['quantity'])
-        price = float(txn['price'])
-        fee = float(txn['fee']) if not pd.isna(txn['fee']) else 0.0
-        datetime = txn['datetime']
+    rows = zip(transactions['symbol'].tolist(), transactions['side'].tolist(),
+               transactions['quantity'].tolist(), transactions['price'].tolist(),
+               transactions['fee'].tolist(), transactions['datetime'].tolist())
+
+    for symbol, side, qty, price, fee, txn_date in rows:
+        side = side.upper()
+        qty = float(qty)
+        price = float(price)
+        fee = float(fee) if not pd.isna(fee) else 0.0
 
         if side == 'BUY':
-            if symbol not in positions:
-                positions[symbol] = []
-            positions[symbol].append({
-                'buy_date': datetime,
+            positions.setdefault(symbol, deque()).append({
+                'buy_date': txn_date,
                 'qty': qty,
                 'buy_price': price,
                 'buy_fee': fee
             })
         elif side == 'SELL':
-            if symbol in positions and positions[symbol]:
+            lots = positions.get(symbol)
+            if lots:
                 remaining_qty = qty
-                while remaining_qty > 0 and positions[symbol]:
-                    buy_position = positions[symbol][0]
+                while remaining_qty > 0 and lots:
+                    buy_position = lots[0]
                     sell_qty = min(remaining_qty, buy_position['qty'])
 
                     pnl = sell_qty * (price - buy_position['buy_price']) - \
@@ -181,7 +214,7 @@ def calculate_trade_pnl(transactions: pd.DataFrame) -> pd.DataFrame:
                     trades.append({
                         'symbol': symbol,
                         'buy_date': buy_position['buy_date'],
-                        'sell_date': datetime,
+                        'sell_date': txn_date,
                         'quantity': sell_qty,
                         'buy_price': buy_position['buy_price'],
                         'sell_price': price,
@@ -193,7 +226,7 @@ def calculate_trade_pnl(transactions: pd.DataFrame) -> pd.DataFrame:
                     remaining_qty -= sell_qty
 
                     if buy_position['qty'] <= 0:
-                        positions[symbol].pop(0)
+                        lots.popleft()
 
     return pd.DataFrame(trades)
 
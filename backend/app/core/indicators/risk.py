@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+SQRT_252 = float(np.sqrt(252))
+
 def calculate_daily_volatility(returns: pd.Series) -> float:
     """Calculate daily volatility (standard deviation of returns)"""
     if returns.empty:
@@ -22,7 +24,7 @@ def calculate_rolling_volatility(returns: pd.Series, window: int, annualize: boo
     rolling_std = returns.rolling(window=window).std()
 
     if annualize:
-        rolling_std = rolling_std * np.sqrt(252)
+        rolling_std = rolling_std * SQRT_252
 
     return rolling_std
 
@@ -37,22 +39,27 @@ def calculate_upside_volatility(returns: pd.Series, annualize: bool = True) -> f
 
     vol = upside_returns.std()
     if annualize:
-        vol = vol * np.sqrt(252)
+        vol = vol * SQRT_252
 
     return float(vol)
 
+def _downside_std(values: np.ndarray, target_return: float = 0.0) -> float:
+    """Sample std (ddof=1) of values below target; 0.0 if none, NaN if only one"""
+    downside = values[values < target_return]
+    if downside.size == 0:
+        return 0.0
+    if downside.size == 1:
+        return np.nan
+    return float(downside.std(ddof=1, dtype=np.float64))
+
 def calculate_downside_volatility(returns: pd.Series, target_return: float = 0.0, annualize: bool = True) -> float:
     """Calculate downside volatility (volatility of returns below target)"""
     if returns.empty:
         return 0.0
 
-    downside_returns = returns[returns < target_return]
-    if downside_returns.empty:
-        return 0.0
-
-    vol = downside_returns.std()
+    vol = _downside_std(returns.to_numpy(), target_return)
     if annualize:
-        vol = vol * np.sqrt(252)
+        vol = vol * SQRT_252
 
     return float(vol)
 
@@ -1,17 +1,17 @@
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
 from .returns import calculate_trade_pnl
+from .utils import longest_run
 
 def calculate_trade_count(transactions: pd.DataFrame) -> int:
     """Calculate total number of trades"""
     if transactions is None or transactions.empty:
         return 0
 
-    buy_count = len(transactions[transactions['side'].str.upper() == 'BUY'])
-    sell_count = len(transactions[transactions['side'].str.upper() == 'SELL'])
+    side_counts = transactions['side'].str.upper().value_counts()
 
-    return int(min(buy_count, sell_count))
+    return int(min(side_counts.get('BUY', 0), side_counts.get('SELL', 0)))
 
 def calculate_turnover_rate(transactions: pd.DataFrame, nav_history: pd.Series) -> float:
     """Calculate annualized turnover rate = trading_volume / average_nav"""
@@ -23,11 +23,9 @@ def calculate_turnover_rate(transactions: pd.DataFrame, nav_history: pd.Series)
     if trade_txns.empty:
         return 0.0
 
-    trading_volume = 0.0
-    for _, txn in trade_txns.iterrows():
-        qty = float(txn['quantity'])
-        price = float(txn['price'])
-        trading_volume += abs(qty * price)
+    qty = trade_txns['quantity'].to_numpy(dtype=np.float64)
+    price = trade_txns['price'].to_numpy(dtype=np.float64)
+    trading_volume = float(np.abs(qty * price).sum())
 
     avg_nav = nav_history.mean()
 
@@ -72,144 +70,120 @@ def calculate_turnover_rate_by_asset(transactions: pd.DataFrame, nav_history: pd
 
     annual_factor = 365.0 / days
 
-    turnover_by_asset = {}
-    for symbol in trade_txns['symbol'].unique():
-        symbol_txns = trade_txns[trade_txns['symbol'] == symbol]
+    codes, symbols = pd.factorize(trade_txns['symbol'], use_na_sentinel=False)
+    qty = trade_txns['quantity'].to_numpy(dtype=np.float64)
+    price = trade_txns['price'].to_numpy(dtype=np.float64)
+    trading_volume = np.bincount(codes, weights=np.abs(qty * price), minlength=len(symbols))
 
-        trading_volume = 0.0
-        for _, txn in symbol_txns.iterrows():
-            qty = float(txn['quantity'])
-            price = float(txn['price'])
-            trading_volume += abs(qty * price)
-
-        turnover = (trading_volume / avg_nav) * annual_factor
-        turnover_by_asset[symbol] = float(turnover)
-
-    return turnover_by_asset
+    turnover = (trading_volume / avg_nav) * annual_factor
+    return dict(zip(symbols.tolist(), turnover.tolist()))
 
-def calculate_avg_holding_period(transactions: pd.DataFrame) -> float:
+def calculate_avg_holding_period(transactions: pd.DataFrame,
+                                 trades: Optional[pd.DataFrame] = None) -> float:
     """Calculate average holding period in days"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0.0
 
-    holding_periods = []
-    for _, trade in trades_df.iterrows():
-        buy_date = pd.to_datetime(trade['buy_date'])
-        sell_date = pd.to_datetime(trade['sell_date'])
-        days = (sell_date - buy_date).days
-        holding_periods.append(days)
-
-    return float(np.mean(holding_periods)) if holding_periods else 0.0
+    holding = pd.to_datetime(trades_df['sell_date']) - pd.to_datetime(trades_df['buy_date'])
+    return float(np.mean(holding.dt.days.to_numpy()))
 
-def calculate_win_rate(transactions: pd.DataFrame) -> float:
+def calculate_win_rate(transactions: pd.DataFrame,
+                       trades: Optional[pd.DataFrame] = None) -> float:
     """Calculate win rate = winning_trades / total_trades"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0.0
 
-    total_trades = len(trades_df)
-    winning_trades = len(trades_df[trades_df['pnl'] > 0])
+    pnl = trades_df['pnl'].to_numpy()
+    winning_trades = np.count_nonzero(pnl > 0)
 
-    return float(winning_trades / total_trades)
+    return float(winning_trades / pnl.size)
 
-def calculate_profit_loss_ratio(transactions: pd.DataFrame) -> float:
+def calculate_profit_loss_ratio(transactions: pd.DataFrame,
+                                trades: Optional[pd.DataFrame] = None) -> float:
     """Calculate profit/loss ratio = avg_win / abs(avg_loss)"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0.0
 
-    winning_trades = trades_df[trades_df['pnl'] > 0]
-    losing_trades = trades_df[trades_df['pnl'] < 0]
+    pnl = trades_df['pnl'].to_numpy()
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
 
-    if winning_trades.empty or losing_trades.empty:
+    if wins.size == 0 or losses.size == 0:
         return 0.0
 
-    avg_win = winning_trades['pnl'].mean()
-    avg_loss = abs(losing_trades['pnl'].mean())
+    avg_win = wins.mean()
+    avg_loss = abs(losses.mean())
 
     if avg_loss == 0:
         return 0.0
 
     return float(avg_win / avg_loss)
 
-def calculate_max_trade_profit(transactions: pd.DataFrame) -> float:
+def calculate_max_trade_profit(transactions: pd.DataFrame,
+                               trades: Optional[pd.DataFrame] = None) -> float:
     """Calculate maximum single trade profit"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0.0
 
     return float(trades_df['pnl'].max())
 
-def calculate_max_trade_loss(transactions: pd.DataFrame) -> float:
+def calculate_max_trade_loss(transactions: pd.DataFrame,
+                             trades: Optional[pd.DataFrame] = None) -> float:
     """Calculate maximum single trade loss"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0.0
 
     return float(trades_df['pnl'].min())
 
-def calculate_consecutive_winning_trades(transactions: pd.DataFrame) -> int:
+def calculate_consecutive_winning_trades(transactions: pd.DataFrame,
+                                         trades: Optional[pd.DataFrame] = None) -> int:
     """Calculate maximum consecutive winning trades"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0
 
-    is_win = trades_df['pnl'] > 0
-    consecutive = 0
-    max_consecutive = 0
+    return longest_run(trades_df['pnl'].to_numpy() > 0)
 
-    for win in is_win:
-        if win:
-            consecutive += 1
-            max_consecutive = max(max_consecutive, consecutive)
-        else:
-            consecutive = 0
-
-    return int(max_consecutive)
-
-def calculate_consecutive_losing_trades(transactions: pd.DataFrame) -> int:
+def calculate_consecutive_losing_trades(transactions: pd.DataFrame,
+                                        trades: Optional[pd.DataFrame] = None) -> int:
     """Calculate maximum consecutive losing trades"""
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0
 
-    is_loss = trades_df['pnl'] < 0
-    consecutive = 0
-    max_consecutive = 0
-
-    for loss in is_loss:
-        if loss:
-            consecutive += 1
-            max_consecutive = max(max_consecutive, consecutive)
-        else:
-            consecutive = 0
-
-    return int(max_consecutive)
+    return longest_run(trades_df['pnl'].to_numpy() < 0)
 
-def calculate_profit_factor(transactions: pd.DataFrame) -> float:
+def calculate_profit_factor(transactions: pd.DataFrame,
+                            trades: Optional[pd.DataFrame] = None) -> float:
     """Calculate Profit Factor = gross_profit / abs(gross_loss)
 
     Args:
         transactions: Transaction DataFrame
+        trades: Precomputed ``calculate_trade_pnl(transactions)``
 
     Returns:
         Profit factor (>1 indicates profitable strategy, >1.5 is good, >2.5 is excellent)
     """
-    trades_df = calculate_trade_pnl(transactions)
+    trades_df = trades if trades is not None else calculate_trade_pnl(transactions)
 
     if trades_df.empty:
         return 0.0
 
-    gross_profit = trades_df[trades_df['pnl'] > 0]['pnl'].sum()
-    gross_loss = abs(trades_df[trades_df['pnl'] < 0]['pnl'].sum())
+    pnl = trades_df['pnl'].to_numpy()
+    gross_profit = np.sum(pnl, where=pnl > 0)
+    gross_loss = -np.sum(pnl, where=pnl < 0)
 
     if gross_loss == 0:
         return float('inf') if gross_profit > 0 else 0.0
@@ -243,7 +217,7 @@ def calculate_recovery_factor(nav_history: pd.Series) -> float:
 def calculate_kelly_criterion(win_rate: float, profit_loss_ratio: float) -> float:
     """Calculate Kelly Criterion for optimal position sizing
 
-    Formula: f* = (bp - q) / b
+    Formula: f* = (bp - q) / b = p - q / b
     where b = profit/loss ratio, p = win rate, q = loss rate
 
     Args:
@@ -256,8 +230,7 @@ def calculate_kelly_criterion(win_rate: float, profit_loss_ratio: float) -> floa
     if win_rate <= 0 or win_rate >= 1 or profit_loss_ratio <= 0:
         return 0.0
 
-    loss_rate = 1 - win_rate
-    kelly = (profit_loss_ratio * win_rate - loss_rate) / profit_loss_ratio
+    kelly = win_rate - (1.0 - win_rate) / profit_loss_ratio
 
     return float(max(0.0, kelly))
 
@@ -279,20 +252,22 @@ def calculate_all_trading_metrics(transactions: pd.DataFrame, nav_history: pd.Se
             'kelly_criterion': 0.0
         }
 
-    win_rate = calculate_win_rate(transactions)
-    pl_ratio = calculate_profit_loss_ratio(transactions)
+    # FIFO-match once; every trade-level metric below reads the same frame
+    trades = calculate_trade_pnl(transactions)
+    win_rate = calculate_win_rate(transactions, trades=trades)
+    pl_ratio = calculate_profit_loss_ratio(transactions, trades=trades)
 
     return {
         'trade_count': calculate_trade_count(transactions),
         'turnover_rate': calculate_turnover_rate(transactions, nav_history),
-        'avg_holding_period': calculate_avg_holding_period(transactions),
+        'avg_holding_period': calculate_avg_holding_period(transactions, trades=trades),
         'win_rate': win_rate,
         'profit_loss_ratio': pl_ratio,
-        'profit_factor': calculate_profit_factor(transactions),
-        'max_trade_profit': calculate_max_trade_profit(transactions),
-        'max_trade_loss': calculate_max_trade_loss(transactions),
-        'consecutive_winning_trades': calculate_consecutive_winning_trades(transactions),
-        'consecutive_losing_trades': calculate_consecutive_losing_trades(transactions),
+        'profit_factor': calculate_profit_factor(transactions, trades=trades),
+        'max_trade_profit': calculate_max_trade_profit(transactions, trades=trades),
+        'max_trade_loss': calculate_max_trade_loss(transactions, trades=trades),
+        'consecutive_winning_trades': calculate_consecutive_winning_trades(transactions, trades=trades),
+        'consecutive_losing_trades': calculate_consecutive_losing_trades(transactions, trades=trades),
         'recovery_factor': calculate_recovery_factor(nav_history),
         'kelly_criterion': calculate_kelly_criterion(win_rate, pl_ratio)
     }
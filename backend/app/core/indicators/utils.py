@@ -1,11 +1,50 @@
 import pandas as pd
 import numpy as np
 
-def rolling_normalize(series: pd.Series, window: int = 21) -> pd.Series:
-    """Apply rolling window normalization to a time series"""
-    rolling_mean = series.rolling(window=window, min_periods=1).mean()
-    rolling_std = series.rolling(window=window, min_periods=1).std()
+def run_bounds(mask: np.ndarray):
+    """Start indices and lengths of each run of True values in a boolean array"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts = edges[::2]
+    return starts, edges[1::2] - starts
+
+def longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values in a boolean array (0 if none)"""
+    return int(run_bounds(mask)[1].max(initial=0))
+
+def _zscore(values: np.ndarray, rolling_mean: np.ndarray, rolling_std: np.ndarray) -> np.ndarray:
+    """Rolling z-score; 0.0 where the window has no std, NaN where the input is NaN"""
     eps = 1e-8
-    normalized = (series - rolling_mean) / (rolling_std + eps)
-    normalized = normalized.ffill().bfill()
+    normalized = (values - rolling_mean) / (rolling_std + eps)
+    normalized[np.isnan(rolling_std) & ~np.isnan(values)] = 0.0
     return normalized
+
+def rolling_normalize(series: pd.Series, window: int = 21, fill_nan: bool = True) -> pd.Series:
+    """Apply rolling window normalization to a time series
+
+    Points whose window holds fewer than two observations have no std and
+    normalize to 0.0. NaN inputs stay NaN unless fill_nan, in which case they
+    are forward then backward filled.
+    """
+    rolling = series.rolling(window=window, min_periods=1)
+    normalized = _zscore(series.to_numpy(dtype=np.float64),
+                         rolling.mean().to_numpy(), rolling.std().to_numpy())
+
+    result = pd.Series(normalized, index=series.index, name=series.name)
+    if fill_nan and np.isnan(normalized).any():
+        result = result.ffill().bfill()
+    return result
+
+def rolling_normalize_frame(df: pd.DataFrame, window: int = 21, fill_nan: bool = True) -> pd.DataFrame:
+    """Apply rolling_normalize to every column of a numeric DataFrame in one call
+
+    Each column matches rolling_normalize(df[col], window, fill_nan).
+    """
+    rolling = df.rolling(window=window, min_periods=1)
+    normalized = _zscore(df.to_numpy(dtype=np.float64),
+                         rolling.mean().to_numpy(), rolling.std().to_numpy())
+
+    result = pd.DataFrame(normalized, index=df.index, columns=df.columns)
+    if fill_nan and np.isnan(normalized).any():
+        result = result.ffill().bfill()
+    return result
@@ -1,103 +1,234 @@
 """Shared pytest fixtures for all tests"""
+import zlib
+from types import MappingProxyType
+
 import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# Shared fixtures are read by many tests; copy-on-write lets derived frames
+# share their blocks instead of copying. Always on (and the option
+# deprecated) from pandas 3.0.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def _read_only(series):
+    """Rebuild a Series over a read-only copy of its values
+
+    Session-scoped fixtures are shared by every test, so any in-place
+    mutation would leak between tests; this makes such writes raise.
+    Shared dicts are wrapped in MappingProxyType for the same reason.
+    """
+    values = series.to_numpy(copy=True)
+    values.flags.writeable = False
+    return pd.Series(values, index=series.index, name=series.name, copy=False)
+
+
+def _read_only_frame(df):
+    """Rebuild a DataFrame over read-only copies of its column values
+
+    Same purpose as _read_only; writes to existing cells raise. Adding or
+    dropping columns still changes the shared frame, so tests copy first.
+    """
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
 
 @pytest.fixture
-def sample_prices():
+def rng(request):
+    """Per-test random generator seeded from the test node id
+
+    Keeps tests off numpy's global RNG so results do not depend on
+    execution order or on how tests are split across workers.
+    """
+    return np.random.default_rng(zlib.crc32(request.node.nodeid.encode()))
+
+
+@pytest.fixture(scope="session")
+def date_indices():
+    """Daily DatetimeIndex from 2020-01-01, sliced by tests to the length they need
+
+    The first 366 entries are calendar year 2020, the span of the sample fixtures.
+    """
+    return pd.date_range('2020-01-01', periods=500, freq='D')
+
+
+@pytest.fixture(scope="session")
+def sample_prices(date_indices):
     """Generate sample price series for testing"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
     prices = 100 * (1 + np.random.randn(len(dates)).cumsum() * 0.01)
     prices = pd.Series(prices, index=dates)
-    return prices
+    return _read_only(prices)
 
 
-@pytest.fixture
-def sample_nav():
+@pytest.fixture(scope="session")
+def sample_prices_np(sample_prices):
+    """sample_prices as a read-only float64 array (a view of the fixture's values)"""
+    return sample_prices.to_numpy(dtype=np.float64, copy=False)
+
+
+@pytest.fixture(scope="session")
+def normal1000():
+    """1000 standard normal draws as a read-only array, for distribution-shape tests"""
+    draws = np.random.default_rng(np.random.SFC64(42)).standard_normal(1000)
+    draws.flags.writeable = False
+    return draws
+
+
+@pytest.fixture(scope="session")
+def close100():
+    """100-point random-walk close prices as a read-only float64 array"""
+    close = np.random.default_rng(42).standard_normal(100).cumsum() + 100
+    close.flags.writeable = False
+    return close
+
+
+@pytest.fixture(scope="session")
+def hlc100():
+    """100-point random-walk (high, low, close) as read-only rows of one (3, 100) float64 buffer"""
+    buf = np.empty((3, 100), dtype=np.float64)
+    np.random.default_rng(42).standard_normal(out=buf)
+    high, low, close = buf
+    np.cumsum(buf[:2], axis=1, out=buf[:2])
+    high += 105
+    low += 95
+    close *= 0.5
+    close += (high + low) / 2
+    for values in (high, low, close):
+        values.flags.writeable = False
+    return high, low, close
+
+
+@pytest.fixture(scope="session")
+def sample_nav(date_indices):
     """Generate sample NAV series with known characteristics"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
     returns = np.random.randn(len(dates)) * 0.01
     nav = 100 * (1 + pd.Series(returns, index=dates)).cumprod()
-    return nav
+    return _read_only(nav.astype(np.float32))
 
 
-@pytest.fixture
-def sample_returns():
+@pytest.fixture(scope="session")
+def sample_returns(date_indices):
     """Generate sample returns series"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
     returns = pd.Series(np.random.randn(len(dates)) * 0.01, index=dates)
-    return returns
+    return _read_only(returns.astype(np.float32))
 
 
-@pytest.fixture
-def positive_returns():
+@pytest.fixture(scope="session")
+def sample_returns_np(sample_returns):
+    """sample_returns as a read-only contiguous float64 array for reference computations"""
+    values = np.ascontiguousarray(sample_returns.to_numpy(dtype=np.float64))
+    values.flags.writeable = False
+    return values
+
+
+@pytest.fixture(scope="session")
+def sample_returns_split(sample_returns):
+    """Sample returns series with its positive and negative values as read-only ndarrays"""
+    values = sample_returns.to_numpy()
+    upside, downside = values[values > 0], values[values < 0]
+    upside.flags.writeable = False
+    downside.flags.writeable = False
+    return sample_returns, upside, downside
+
+
+@pytest.fixture(scope="session")
+def sample_returns_partitions(sample_returns_split):
+    """Sum of gains, absolute sum of losses, and the sample returns series"""
+    returns, upside, downside = sample_returns_split
+    gains = float(upside.sum(dtype=np.float64))
+    losses = float(-downside.sum(dtype=np.float64))
+    return gains, losses, returns
+
+
+@pytest.fixture(scope="session")
+def positive_returns(date_indices):
     """Generate returns series with only positive values"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
     returns = pd.Series(np.abs(np.random.randn(len(dates))) * 0.01, index=dates)
-    return returns
+    return _read_only(returns)
 
 
-@pytest.fixture
-def negative_returns():
+@pytest.fixture(scope="session")
+def negative_returns(date_indices):
     """Generate returns series with only negative values"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
     returns = pd.Series(-np.abs(np.random.randn(len(dates))) * 0.01, index=dates)
-    return returns
+    return _read_only(returns)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def positive_returns_volatility(positive_returns):
+    """Annualized sample std of positive_returns, and the series itself"""
+    return float(positive_returns.std() * np.sqrt(252)), positive_returns
+
+
+@pytest.fixture(scope="session")
+def negative_returns_volatility(negative_returns):
+    """Annualized sample std of negative_returns, and the series itself"""
+    return float(negative_returns.std() * np.sqrt(252)), negative_returns
+
+
+@pytest.fixture(scope="session")
 def empty_series():
     """Empty pandas Series"""
-    return pd.Series(dtype=float)
+    return _read_only(pd.Series(dtype=float))
 
 
 @pytest.fixture
 def empty_dataframe():
-    """Empty pandas DataFrame"""
+    """Empty pandas DataFrame (per test: it has no column arrays to freeze)"""
     return pd.DataFrame()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_transactions():
     """Generate sample transaction DataFrame"""
-    data = [
-        {'datetime': pd.Timestamp('2020-01-01'), 'symbol': 'AAPL', 'side': 'BUY', 'quantity': 100, 'price': 100.0, 'fee': 1.0},
-        {'datetime': pd.Timestamp('2020-02-01'), 'symbol': 'GOOGL', 'side': 'BUY', 'quantity': 50, 'price': 200.0, 'fee': 1.0},
-        {'datetime': pd.Timestamp('2020-03-01'), 'symbol': 'AAPL', 'side': 'SELL', 'quantity': 50, 'price': 110.0, 'fee': 0.5},
-        {'datetime': pd.Timestamp('2020-04-01'), 'symbol': 'GOOGL', 'side': 'SELL', 'quantity': 25, 'price': 210.0, 'fee': 0.5},
-        {'datetime': pd.Timestamp('2020-05-01'), 'symbol': 'AAPL', 'side': 'BUY', 'quantity': 50, 'price': 105.0, 'fee': 0.5},
-        {'datetime': pd.Timestamp('2020-06-01'), 'symbol': 'AAPL', 'side': 'SELL', 'quantity': 100, 'price': 120.0, 'fee': 1.0},
-    ]
-    return pd.DataFrame(data)
-
-
-@pytest.fixture
+    return _read_only_frame(pd.DataFrame({
+        'datetime': pd.to_datetime(['2020-01-01', '2020-02-01', '2020-03-01',
+                                    '2020-04-01', '2020-05-01', '2020-06-01']),
+        'symbol': ['AAPL', 'GOOGL', 'AAPL', 'GOOGL', 'AAPL', 'AAPL'],
+        'side': ['BUY', 'BUY', 'SELL', 'SELL', 'BUY', 'SELL'],
+        'quantity': np.array([100, 50, 50, 25, 50, 100], dtype=np.int64),
+        'price': np.array([100.0, 200.0, 110.0, 210.0, 105.0, 120.0]),
+        'fee': np.array([1.0, 1.0, 0.5, 0.5, 0.5, 1.0]),
+    }))
+
+
+@pytest.fixture(scope="session")
 def sample_holdings():
     """Generate sample holdings dictionary"""
-    return {
+    return MappingProxyType({
         'AAPL': 100,
         'GOOGL': 50,
         'MSFT': 75,
         'AMZN': 25
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_prices_dict():
     """Generate sample prices dictionary"""
-    return {
+    return MappingProxyType({
         'AAPL': 150.0,
         'GOOGL': 2800.0,
         'MSFT': 300.0,
         'AMZN': 3300.0
-    }
+    })
 
 
 @pytest.fixture
@@ -112,9 +243,9 @@ def sample_weights():
 
 
 @pytest.fixture
-def sample_price_history():
+def sample_price_history(date_indices):
     """Generate sample price history DataFrame"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
 
     data = {}
@@ -127,10 +258,10 @@ def sample_price_history():
     return pd.DataFrame(data, index=dates)
 
 
-@pytest.fixture
-def sample_ohlcv_data():
+@pytest.fixture(scope="session")
+def sample_ohlcv_data(date_indices):
     """Generate sample OHLCV DataFrame for technical indicators"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
 
     close = 100 * (1 + np.random.randn(len(dates)).cumsum() * 0.01)
@@ -139,13 +270,13 @@ def sample_ohlcv_data():
     open_prices = close * (1 + np.random.randn(len(dates)) * 0.005)
     volume = np.random.randint(1000000, 10000000, size=len(dates))
 
-    return pd.DataFrame({
+    return _read_only_frame(pd.DataFrame({
         'Open': open_prices,
         'High': high,
         'Low': low,
         'Close': close,
         'Volume': volume
-    }, index=dates)
+    }, index=dates))
 
 
 @pytest.fixture
@@ -170,51 +301,48 @@ def industry_map():
     }
 
 
-@pytest.fixture
-def benchmark_returns():
+@pytest.fixture(scope="session")
+def benchmark_returns(date_indices):
     """Generate sample benchmark returns"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(123)
     returns = pd.Series(np.random.randn(len(dates)) * 0.008, index=dates)
-    return returns
+    return _read_only(returns)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def cashflows():
     """Generate sample cashflow DataFrame"""
-    data = [
-        {'date': pd.Timestamp('2020-01-01'), 'amount': -10000},
-        {'date': pd.Timestamp('2020-04-01'), 'amount': -5000},
-        {'date': pd.Timestamp('2020-08-01'), 'amount': 3000},
-        {'date': pd.Timestamp('2020-12-31'), 'amount': 15000}
-    ]
-    return pd.DataFrame(data)
+    return _read_only_frame(pd.DataFrame({
+        'date': pd.to_datetime(['2020-01-01', '2020-04-01', '2020-08-01', '2020-12-31']),
+        'amount': np.array([-10000, -5000, 3000, 15000], dtype=np.int64),
+    }))
 
 
 @pytest.fixture
-def constant_series():
+def constant_series(date_indices):
     """Generate series with constant values"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     return pd.Series(100.0, index=dates)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def single_value_series():
     """Generate series with single value"""
-    return pd.Series([100.0], index=[pd.Timestamp('2020-01-01')])
+    return _read_only(pd.Series([100.0], index=[pd.Timestamp('2020-01-01')]))
 
 
-@pytest.fixture
-def zero_returns():
+@pytest.fixture(scope="session")
+def zero_returns(date_indices):
     """Generate returns series with all zeros"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
-    return pd.Series(0.0, index=dates)
+    dates = date_indices[:366]
+    return _read_only(pd.Series(0.0, index=dates))
 
 
 @pytest.fixture
-def correlated_returns():
+def correlated_returns(date_indices):
     """Generate two correlated return series"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
     base_returns = np.random.randn(len(dates)) * 0.01
 
@@ -225,9 +353,26 @@ def correlated_returns():
 
 
 @pytest.fixture
-def multi_asset_returns():
+def correlated_returns_np(correlated_returns):
+    """Correlated return series as raw numpy arrays for reference computations"""
+    portfolio_returns, benchmark_returns = correlated_returns
+    return portfolio_returns.to_numpy(), benchmark_returns.to_numpy()
+
+
+@pytest.fixture
+def benchmark_dict(correlated_returns, sample_returns):
+    """Generate named benchmark return series for multi-benchmark metrics"""
+    _, benchmark_returns = correlated_returns
+    return {
+        'SPY': benchmark_returns,
+        'QQQ': sample_returns
+    }
+
+
+@pytest.fixture
+def multi_asset_returns(date_indices):
     """Generate returns DataFrame with multiple assets"""
-    dates = pd.date_range(start='2020-01-01', end='2020-12-31', freq='D')
+    dates = date_indices[:366]
     np.random.seed(42)
 
     returns_data = {}
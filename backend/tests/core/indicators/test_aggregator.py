@@ -13,7 +13,7 @@ class TestBasicPortfolioIndicators:
         """Test basic portfolio indicators"""
         result = agg_module.calculate_basic_portfolio_indicators(sample_nav)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'total_return' in result
         assert 'cagr' in result
         assert 'volatility' in result
@@ -24,7 +24,7 @@ class TestBasicPortfolioIndicators:
         """Test with empty NAV"""
         result = agg_module.calculate_basic_portfolio_indicators(empty_series)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert result['total_return'] == 0.0
         assert result['cagr'] == 0.0
 
@@ -44,7 +44,7 @@ class TestAllPortfolioIndicators:
         """Test basic all indicators"""
         result = agg_module.calculate_all_portfolio_indicators(sample_nav)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'returns' in result
         assert 'risk' in result
         assert 'drawdown' in result
@@ -250,7 +250,7 @@ class TestBenchmarkComparison:
             sample_returns, benchmark_dict
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'SPY' in result
         assert 'QQQ' in result
 
@@ -320,7 +320,7 @@ class TestFullIndicatorCalculation:
         # Test calculate_basic_metrics alias
         result = calculate_basic_metrics(sample_nav)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'total_return' in result
 
 
@@ -1,10 +1,20 @@
 """Tests for allocation module"""
+import math
+from functools import lru_cache
+from types import MappingProxyType
+
 import pytest
 import pandas as pd
 import numpy as np
 from app.core.indicators import allocation as allocation_module
 
 
+@lru_cache(maxsize=None)
+def _equal_weight_dict(n):
+    """Equal weights over n synthetic assets (cached, so returned read-only)"""
+    return MappingProxyType({f'Asset{i}': 1.0 / n for i in range(n)})
+
+
 class TestCalculateWeights:
     """Test suite for calculate_weights"""
 
@@ -12,10 +22,10 @@ class TestCalculateWeights:
         """Test basic weight calculation"""
         result = allocation_module.calculate_weights(sample_holdings, sample_prices_dict)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert len(result) == len(sample_holdings)
         # Weights should sum to 1
-        assert np.isclose(sum(result.values()), 1.0)
+        assert math.isclose(math.fsum(result.values()), 1.0, abs_tol=1e-12)
 
     def test_weights_empty(self):
         """Test with empty holdings or prices"""
@@ -60,7 +70,7 @@ class TestWeightHistory:
 
         result = allocation_module.calculate_weight_history(holdings, sample_price_history)
 
-        assert isinstance(result, pd.DataFrame)
+        assert type(result) is pd.DataFrame
         assert result.shape == holdings.shape
         # Each row should sum to 1
         assert np.allclose(result.sum(axis=1), 1.0)
@@ -78,7 +88,7 @@ class TestTopNConcentration:
         """Test basic top N concentration"""
         result = allocation_module.calculate_top_n_concentration(sample_weights, n=2)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert 0 <= result <= 1.0
 
     def test_top_n_formula(self):
@@ -109,7 +119,7 @@ class TestHHI:
         """Test basic HHI calculation"""
         result = allocation_module.calculate_hhi(sample_weights)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result > 0
 
     def test_hhi_formula(self):
@@ -128,11 +138,9 @@ class TestHHI:
     def test_hhi_equal_weights(self):
         """Test HHI with equal weights"""
         n = 4
-        weights = {f'Asset{i}': 1.0/n for i in range(n)}
-
-        result = allocation_module.calculate_hhi(weights)
-        expected = n * (1.0/n)**2  # = 1/n
-        assert np.isclose(result, expected)
+        result = allocation_module.calculate_hhi(_equal_weight_dict(n))
+        # n * (1/n)^2 simplifies to 1/n
+        assert np.isclose(result, 1.0 / n)
 
 
 class TestSectorAllocation:
@@ -144,7 +152,7 @@ class TestSectorAllocation:
             sample_holdings, sample_prices_dict, sector_map
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'Technology' in result or 'Consumer' in result
 
     def test_sector_allocation_empty(self):
@@ -159,7 +167,7 @@ class TestSectorAllocation:
         )
 
         if result:
-            assert np.isclose(sum(result.values()), 1.0)
+            assert math.isclose(math.fsum(result.values()), 1.0, abs_tol=1e-12)
 
 
 class TestIndustryAllocation:
@@ -171,7 +179,7 @@ class TestIndustryAllocation:
             sample_holdings, sample_prices_dict, industry_map
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
 
     def test_industry_allocation_empty(self):
         """Test with empty inputs"""
@@ -186,7 +194,7 @@ class TestMaxWeight:
         """Test basic max weight calculation"""
         result = allocation_module.calculate_max_weight(sample_weights)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result > 0
 
     def test_max_weight_formula(self):
@@ -209,15 +217,12 @@ class TestWeightDeviationFromEqual:
         """Test basic deviation calculation"""
         result = allocation_module.calculate_weight_deviation_from_equal(sample_weights)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_deviation_equal_weights(self):
         """Test with equal weights (deviation should be 0)"""
-        n = 4
-        weights = {f'Asset{i}': 1.0/n for i in range(n)}
-
-        result = allocation_module.calculate_weight_deviation_from_equal(weights)
+        result = allocation_module.calculate_weight_deviation_from_equal(_equal_weight_dict(4))
         assert np.isclose(result, 0.0, atol=1e-10)
 
     def test_deviation_empty(self):
@@ -236,7 +241,7 @@ class TestLongShortExposure:
 
         result = allocation_module.calculate_long_short_exposure(holdings, prices)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'long_exposure' in result
         assert 'short_exposure' in result
         assert 'net_exposure' in result
@@ -269,7 +274,7 @@ class TestPortfolioVolatility:
             sample_weights, sample_price_history
         )
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_portfolio_volatility_empty(self, empty_dataframe):
@@ -285,7 +290,7 @@ class TestMCTR:
         """Test basic MCTR calculation"""
         result = allocation_module.calculate_mctr(sample_weights, sample_price_history)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert len(result) <= len(sample_weights)
 
     def test_mctr_empty(self, empty_dataframe):
@@ -303,7 +308,7 @@ class TestRiskContribution:
             sample_weights, sample_price_history
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
 
         for symbol, risk_data in result.items():
             assert 'mctr' in risk_data
@@ -318,7 +323,7 @@ class TestRiskContribution:
             sample_weights, sample_price_history, sector_map
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
 
     def test_risk_contribution_empty(self, empty_dataframe):
         """Test with empty inputs"""
@@ -341,4 +346,4 @@ def test_allocation_functions_return_float(func_name, sample_weights):
     else:
         result = func(sample_weights)
 
-    assert isinstance(result, float)
+    assert type(result) is float
@@ -1,10 +1,32 @@
 """Tests for drawdown module"""
-import pytest
 import pandas as pd
 import numpy as np
 from app.core.indicators import drawdown as drawdown_module
 
 
+# Hand-built paths shared by the formula tests. Only the recovery paths keep a
+# DatetimeIndex because recovery_days is measured as a calendar-day delta.
+_NAV_RISING = pd.Series(np.array([100, 110, 120, 130], dtype=np.float64))
+_NAV_FALLING = pd.Series(np.array([100, 90, 80, 70], dtype=np.float64))
+_NAV_NEW_HIGHS = pd.Series(np.array([100, 110, 105, 115, 120], dtype=np.float64))
+_NAV_DIP = pd.Series(np.array([100, 110, 80, 90], dtype=np.float64))
+_NAV_CRASH = pd.Series(np.array([100, 120, 60, 100], dtype=np.float64))
+# Six-day shallow drawdown, then a two-day deeper one whose trough is on its second day
+_NAV_TWO_DRAWDOWNS = pd.Series(np.array([100, 90, 92, 94, 96, 97, 98, 100, 80, 70, 100],
+                                        dtype=np.float64))
+_NAV_SHORT = pd.Series(np.array([100, 105, 103], dtype=np.float64))
+_NAV_COMPOUNDING = pd.Series(100.0 * np.power(1.01, np.arange(50, dtype=np.float64)))
+_NAV_RECOVERED = pd.Series(np.array([100, 120, 60, 100, 120], dtype=np.float64),
+                           index=pd.date_range('2020-01-01', periods=5))
+_NAV_UNRECOVERED = pd.Series(np.array([100, 120, 60, 70, 80], dtype=np.float64),
+                             index=pd.date_range('2020-01-01', periods=5))
+
+_RETURNS_LOSS_RUN = pd.Series([0.01, -0.01, -0.02, -0.01, 0.01, -0.01])
+_RETURNS_GAIN_RUN = pd.Series([-0.01, 0.01, 0.02, 0.01, -0.01, 0.01])
+_RETURNS_WORST_DAY = pd.Series([0.01, 0.02, -0.05, 0.01, -0.03])
+_RETURNS_BEST_DAY = pd.Series([0.01, 0.05, -0.02, 0.01, -0.03])
+
+
 class TestDrawdownSeries:
     """Test suite for calculate_drawdown_series"""
 
@@ -12,22 +34,19 @@ class TestDrawdownSeries:
         """Test basic drawdown series calculation"""
         result = drawdown_module.calculate_drawdown_series(sample_nav)
 
-        assert isinstance(result, pd.Series)
+        assert type(result) is pd.Series
         assert len(result) == len(sample_nav)
         assert (result <= 0).all()  # Drawdowns are non-positive
 
     def test_drawdown_series_formula(self):
         """Test drawdown formula: (NAV - peak) / peak"""
-        nav = pd.Series([100, 110, 105, 115, 120],
-                        index=pd.date_range('2020-01-01', periods=5))
-
-        result = drawdown_module.calculate_drawdown_series(nav)
+        arr = drawdown_module.calculate_drawdown_series(_NAV_NEW_HIGHS).to_numpy()
 
-        assert result.iloc[0] == 0.0  # First value is at peak
-        assert result.iloc[1] == 0.0  # New peak
-        assert np.isclose(result.iloc[2], (105 - 110) / 110)
-        assert result.iloc[3] == 0.0  # New peak
-        assert result.iloc[4] == 0.0  # New peak
+        assert arr[0] == 0.0  # First value is at peak
+        assert arr[1] == 0.0  # New peak
+        assert abs(arr[2] - (105 - 110) / 110) < 1e-9
+        assert arr[3] == 0.0  # New peak
+        assert arr[4] == 0.0  # New peak
 
     def test_drawdown_series_empty(self, empty_series):
         """Test with empty series"""
@@ -36,25 +55,20 @@ class TestDrawdownSeries:
 
     def test_drawdown_series_increasing(self):
         """Test with always increasing NAV"""
-        nav = pd.Series([100, 110, 120, 130],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_drawdown_series(nav)
+        result = drawdown_module.calculate_drawdown_series(_NAV_RISING)
 
         # Should be all zeros
         assert (result == 0.0).all()
 
     def test_drawdown_series_decreasing(self):
         """Test with always decreasing NAV"""
-        nav = pd.Series([100, 90, 80, 70],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_drawdown_series(nav)
+        result = drawdown_module.calculate_drawdown_series(_NAV_FALLING)
 
         # Should be increasingly negative
         assert (result <= 0).all()
-        assert result.iloc[0] == 0.0
-        assert result.iloc[1] < result.iloc[0]
+        arr = result.to_numpy()
+        assert arr[0] == 0.0
+        assert arr[1] < arr[0]
 
 
 class TestMaxDrawdown:
@@ -64,43 +78,29 @@ class TestMaxDrawdown:
         """Test basic max drawdown calculation"""
         result = drawdown_module.calculate_max_drawdown(sample_nav)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result <= 0.0  # Max drawdown is non-positive
 
     def test_max_drawdown_formula(self):
         """Test max drawdown is minimum of drawdown series"""
-        nav = pd.Series([100, 110, 80, 90],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_max_drawdown(nav)
+        result = drawdown_module.calculate_max_drawdown(_NAV_DIP)
 
         # Max drawdown should be at index 2: (80 - 110) / 110
         expected = (80 - 110) / 110
-        assert np.isclose(result, expected)
-
-    def test_max_drawdown_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_max_drawdown(empty_series)
-        assert result == 0.0
+        assert abs(result - expected) < 1e-9
 
     def test_max_drawdown_increasing(self):
         """Test with always increasing NAV"""
-        nav = pd.Series([100, 110, 120, 130],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_max_drawdown(nav)
+        result = drawdown_module.calculate_max_drawdown(_NAV_RISING)
         assert result == 0.0
 
     def test_max_drawdown_crash_recovery(self):
         """Test max drawdown with crash and recovery"""
-        nav = pd.Series([100, 120, 60, 100],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_max_drawdown(nav)
+        result = drawdown_module.calculate_max_drawdown(_NAV_CRASH)
 
         # Max drawdown at index 2: (60 - 120) / 120 = -0.5
         expected = (60 - 120) / 120
-        assert np.isclose(result, expected)
+        assert abs(result - expected) < 1e-9
 
 
 class TestDrawdownDuration:
@@ -110,27 +110,30 @@ class TestDrawdownDuration:
         """Test basic drawdown duration calculation"""
         result = drawdown_module.calculate_drawdown_duration(sample_nav)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'max_drawdown_duration' in result
         assert 'longest_drawdown_period' in result
         assert 'avg_drawdown_duration' in result
 
-    def test_drawdown_duration_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_drawdown_duration(empty_series)
-        assert result == {}
-
     def test_drawdown_duration_no_drawdown(self):
         """Test with no drawdowns"""
-        nav = pd.Series([100, 110, 120, 130],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_drawdown_duration(nav)
+        result = drawdown_module.calculate_drawdown_duration(_NAV_RISING)
 
         assert result['max_drawdown_duration'] == 0.0
         assert result['longest_drawdown_period'] == 0.0
         assert result['avg_drawdown_duration'] == 0.0
 
+    def test_drawdown_duration_two_periods(self):
+        """Test durations when the deepest trough is not in the longest period"""
+        result = drawdown_module.calculate_drawdown_duration(_NAV_TWO_DRAWDOWNS)
+
+        # Periods of 6 days (trough -10% on day 1) and 2 days (trough -30% on day 2)
+        assert result == {
+            'max_drawdown_duration': 2.0,
+            'longest_drawdown_period': 6.0,
+            'avg_drawdown_duration': 4.0,
+        }
+
 
 class TestAvgDrawdown:
     """Test suite for calculate_avg_drawdown"""
@@ -139,20 +142,12 @@ class TestAvgDrawdown:
         """Test basic average drawdown calculation"""
         result = drawdown_module.calculate_avg_drawdown(sample_nav)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result <= 0.0  # Average drawdown is non-positive
 
-    def test_avg_drawdown_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_avg_drawdown(empty_series)
-        assert result == 0.0
-
     def test_avg_drawdown_no_drawdown(self):
         """Test with no drawdowns"""
-        nav = pd.Series([100, 110, 120, 130],
-                        index=pd.date_range('2020-01-01', periods=4))
-
-        result = drawdown_module.calculate_avg_drawdown(nav)
+        result = drawdown_module.calculate_avg_drawdown(_NAV_RISING)
         assert result == 0.0
 
 
@@ -163,12 +158,7 @@ class TestRecoveryTime:
         """Test basic recovery time calculation"""
         result = drawdown_module.calculate_recovery_time(sample_nav)
 
-        assert isinstance(result, dict)
-
-    def test_recovery_time_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_recovery_time(empty_series)
-        assert result == {}
+        assert type(result) is dict
 
     def test_recovery_time_single_value(self, single_value_series):
         """Test with single value"""
@@ -177,21 +167,16 @@ class TestRecoveryTime:
 
     def test_recovery_time_full_recovery(self):
         """Test with full recovery"""
-        nav = pd.Series([100, 120, 60, 100, 120],
-                        index=pd.date_range('2020-01-01', periods=5))
-
-        result = drawdown_module.calculate_recovery_time(nav)
+        result = drawdown_module.calculate_recovery_time(_NAV_RECOVERED)
 
         assert 'recovery_days' in result
         assert 'recovered' in result
         assert result['recovered'] == True
+        assert result['recovery_days'] == 2.0  # Trough on day 3, back at 120 on day 5
 
     def test_recovery_time_no_recovery(self):
         """Test with no recovery"""
-        nav = pd.Series([100, 120, 60, 70, 80],
-                        index=pd.date_range('2020-01-01', periods=5))
-
-        result = drawdown_module.calculate_recovery_time(nav)
+        result = drawdown_module.calculate_recovery_time(_NAV_UNRECOVERED)
 
         assert 'recovery_days' in result
         assert 'recovered' in result
@@ -206,21 +191,14 @@ class TestMaxDailyLoss:
         """Test basic max daily loss calculation"""
         result = drawdown_module.calculate_max_daily_loss(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result <= 0.0  # Max loss is non-positive
 
     def test_max_daily_loss_formula(self):
         """Test max daily loss is minimum return"""
-        returns = pd.Series([0.01, 0.02, -0.05, 0.01, -0.03])
-
-        result = drawdown_module.calculate_max_daily_loss(returns)
+        result = drawdown_module.calculate_max_daily_loss(_RETURNS_WORST_DAY)
         expected = -0.05
-        assert np.isclose(result, expected)
-
-    def test_max_daily_loss_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_max_daily_loss(empty_series)
-        assert result == 0.0
+        assert abs(result - expected) < 1e-9
 
 
 class TestMaxDailyGain:
@@ -230,21 +208,14 @@ class TestMaxDailyGain:
         """Test basic max daily gain calculation"""
         result = drawdown_module.calculate_max_daily_gain(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0.0  # Max gain is non-negative (or zero)
 
     def test_max_daily_gain_formula(self):
         """Test max daily gain is maximum return"""
-        returns = pd.Series([0.01, 0.05, -0.02, 0.01, -0.03])
-
-        result = drawdown_module.calculate_max_daily_gain(returns)
+        result = drawdown_module.calculate_max_daily_gain(_RETURNS_BEST_DAY)
         expected = 0.05
-        assert np.isclose(result, expected)
-
-    def test_max_daily_gain_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_max_daily_gain(empty_series)
-        assert result == 0.0
+        assert abs(result - expected) < 1e-9
 
 
 class TestConsecutiveLossDays:
@@ -254,22 +225,15 @@ class TestConsecutiveLossDays:
         """Test basic consecutive loss days calculation"""
         result = drawdown_module.calculate_consecutive_loss_days(sample_returns)
 
-        assert isinstance(result, int)
+        assert type(result) is int
         assert result >= 0
 
     def test_consecutive_loss_days_formula(self):
         """Test consecutive loss days counting"""
-        returns = pd.Series([0.01, -0.01, -0.02, -0.01, 0.01, -0.01])
-
-        result = drawdown_module.calculate_consecutive_loss_days(returns)
+        result = drawdown_module.calculate_consecutive_loss_days(_RETURNS_LOSS_RUN)
         expected = 3  # Three consecutive losses at indices 1, 2, 3
         assert result == expected
 
-    def test_consecutive_loss_days_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_consecutive_loss_days(empty_series)
-        assert result == 0
-
     def test_consecutive_loss_days_only_gains(self, positive_returns):
         """Test with only positive returns"""
         result = drawdown_module.calculate_consecutive_loss_days(positive_returns)
@@ -283,22 +247,15 @@ class TestConsecutiveGainDays:
         """Test basic consecutive gain days calculation"""
         result = drawdown_module.calculate_consecutive_gain_days(sample_returns)
 
-        assert isinstance(result, int)
+        assert type(result) is int
         assert result >= 0
 
     def test_consecutive_gain_days_formula(self):
         """Test consecutive gain days counting"""
-        returns = pd.Series([-0.01, 0.01, 0.02, 0.01, -0.01, 0.01])
-
-        result = drawdown_module.calculate_consecutive_gain_days(returns)
+        result = drawdown_module.calculate_consecutive_gain_days(_RETURNS_GAIN_RUN)
         expected = 3  # Three consecutive gains at indices 1, 2, 3
         assert result == expected
 
-    def test_consecutive_gain_days_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_consecutive_gain_days(empty_series)
-        assert result == 0
-
     def test_consecutive_gain_days_only_losses(self, negative_returns):
         """Test with only negative returns"""
         result = drawdown_module.calculate_consecutive_gain_days(negative_returns)
@@ -312,54 +269,95 @@ class TestUlcerIndex:
         """Test basic Ulcer Index calculation"""
         result = drawdown_module.calculate_ulcer_index(sample_nav)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0.0  # Ulcer Index is non-negative
 
-    def test_ulcer_index_empty(self, empty_series):
-        """Test with empty series"""
-        result = drawdown_module.calculate_ulcer_index(empty_series)
-        assert result == 0.0
-
     def test_ulcer_index_short_series(self):
         """Test with series shorter than window"""
-        nav = pd.Series([100, 105, 103],
-                        index=pd.date_range('2020-01-01', periods=3))
-
-        result = drawdown_module.calculate_ulcer_index(nav, window=14)
+        result = drawdown_module.calculate_ulcer_index(_NAV_SHORT, window=14)
         assert result == 0.0
 
     def test_ulcer_index_no_drawdown(self):
         """Test with no drawdowns"""
-        nav = pd.Series([100 * 1.01 ** i for i in range(50)],
-                        index=pd.date_range('2020-01-01', periods=50))
-
-        result = drawdown_module.calculate_ulcer_index(nav, window=14)
-        assert result == 0.0 or np.isclose(result, 0.0, atol=1e-6)
+        result = drawdown_module.calculate_ulcer_index(_NAV_COMPOUNDING, window=14)
+        assert abs(result) < 1e-6
 
-    @pytest.mark.parametrize("window", [7, 14, 21, 30])
-    def test_ulcer_index_windows(self, sample_nav, window):
+    def test_ulcer_index_windows(self, sample_nav):
         """Test with various window sizes"""
-        if len(sample_nav) >= window:
+        for window in (7, 14, 21, 30):
             result = drawdown_module.calculate_ulcer_index(sample_nav, window=window)
-            assert isinstance(result, float)
-            assert result >= 0.0
-
-
-@pytest.mark.parametrize("func_name,expected_type", [
-    ("calculate_max_drawdown", float),
-    ("calculate_avg_drawdown", float),
-    ("calculate_max_daily_loss", float),
-    ("calculate_max_daily_gain", float),
-    ("calculate_consecutive_loss_days", int),
-    ("calculate_consecutive_gain_days", int),
-])
-def test_drawdown_functions_type(func_name, expected_type, sample_nav, sample_returns):
-    """Parametrized test for drawdown function output types"""
-    func = getattr(drawdown_module, func_name)
-
-    if 'daily' in func_name or 'consecutive' in func_name:
-        result = func(sample_returns)
-    else:
-        result = func(sample_nav)
-
-    assert isinstance(result, expected_type)
+            assert type(result) is float, window
+            assert result >= 0.0, window
+
+
+class TestSharedPeaks:
+    """Test suite for passing a precomputed running peak"""
+
+    def test_running_peak_matches_expanding_max(self, sample_nav):
+        """Test running peak equals pandas expanding max"""
+        peaks = drawdown_module.calculate_running_peak(sample_nav)
+        assert np.allclose(peaks, sample_nav.expanding().max().to_numpy())
+
+    def test_float32_nav_computed_in_float64(self, sample_nav):
+        """Test float32 NAV is upcast, so results match the float64 path within float32 rounding"""
+        nav64 = sample_nav.astype(np.float64)
+
+        assert drawdown_module.calculate_running_peak(sample_nav).dtype == np.float64
+        np.testing.assert_allclose(drawdown_module.calculate_max_drawdown(sample_nav),
+                                   drawdown_module.calculate_max_drawdown(nav64), rtol=1e-6)
+        np.testing.assert_allclose(drawdown_module.calculate_ulcer_index(sample_nav),
+                                   drawdown_module.calculate_ulcer_index(nav64), rtol=1e-6)
+
+    def test_shared_peaks_same_results(self, sample_nav):
+        """Test every drawdown metric gives the same result with shared peaks"""
+        peaks = drawdown_module.calculate_running_peak(sample_nav)
+
+        assert drawdown_module.calculate_max_drawdown(sample_nav, peaks) == \
+            drawdown_module.calculate_max_drawdown(sample_nav)
+        assert drawdown_module.calculate_avg_drawdown(sample_nav, peaks) == \
+            drawdown_module.calculate_avg_drawdown(sample_nav)
+        assert drawdown_module.calculate_drawdown_duration(sample_nav, peaks) == \
+            drawdown_module.calculate_drawdown_duration(sample_nav)
+        assert drawdown_module.calculate_recovery_time(sample_nav, peaks) == \
+            drawdown_module.calculate_recovery_time(sample_nav)
+        assert drawdown_module.calculate_ulcer_index(sample_nav, peaks=peaks) == \
+            drawdown_module.calculate_ulcer_index(sample_nav)
+
+
+DRAWDOWN_TYPE_CASES = (
+    (drawdown_module.calculate_max_drawdown, 'nav', float),
+    (drawdown_module.calculate_avg_drawdown, 'nav', float),
+    (drawdown_module.calculate_max_daily_loss, 'returns', float),
+    (drawdown_module.calculate_max_daily_gain, 'returns', float),
+    (drawdown_module.calculate_consecutive_loss_days, 'returns', int),
+    (drawdown_module.calculate_consecutive_gain_days, 'returns', int),
+)
+
+
+def test_drawdown_functions_type(sample_nav, sample_returns):
+    """Test drawdown function output types"""
+    inputs = {'nav': sample_nav, 'returns': sample_returns}
+
+    for func, input_name, expected_type in DRAWDOWN_TYPE_CASES:
+        result = func(inputs[input_name])
+        assert type(result) is expected_type, func.__name__
+
+
+DRAWDOWN_EMPTY_CASES = (
+    (drawdown_module.calculate_max_drawdown, 0.0),
+    (drawdown_module.calculate_avg_drawdown, 0.0),
+    (drawdown_module.calculate_drawdown_duration, {}),
+    (drawdown_module.calculate_recovery_time, {}),
+    (drawdown_module.calculate_max_daily_loss, 0.0),
+    (drawdown_module.calculate_max_daily_gain, 0.0),
+    (drawdown_module.calculate_consecutive_loss_days, 0),
+    (drawdown_module.calculate_consecutive_gain_days, 0),
+    (drawdown_module.calculate_ulcer_index, 0.0),
+)
+
+
+def test_drawdown_functions_empty(subtests, empty_series):
+    """Test that every scalar drawdown metric returns its empty value for empty input"""
+    for func, expected in DRAWDOWN_EMPTY_CASES:
+        with subtests.test(func=func.__name__):
+            assert func(empty_series) == expected
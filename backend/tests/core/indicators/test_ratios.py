@@ -12,7 +12,7 @@ class TestSharpeRatio:
         """Test basic Sharpe ratio calculation"""
         result = ratios_module.calculate_sharpe_ratio(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_sharpe_ratio_formula(self):
         """Test Sharpe ratio formula: (return - rf) / volatility"""
@@ -52,7 +52,7 @@ class TestRollingSharpe:
         """Test basic rolling Sharpe calculation"""
         result = ratios_module.calculate_rolling_sharpe(sample_returns, window=252)
 
-        assert isinstance(result, pd.Series)
+        assert type(result) is pd.Series
         assert len(result) == len(sample_returns)
 
     def test_rolling_sharpe_empty(self, empty_series):
@@ -60,11 +60,36 @@ class TestRollingSharpe:
         result = ratios_module.calculate_rolling_sharpe(empty_series)
         assert result.empty
 
-    @pytest.mark.parametrize("window", [30, 60, 126, 252])
-    def test_rolling_sharpe_windows(self, sample_returns, window):
-        """Test with various window sizes"""
-        result = ratios_module.calculate_rolling_sharpe(sample_returns, window=window)
-        assert len(result) == len(sample_returns)
+    def test_rolling_sharpe_windows(self, sample_returns):
+        """Test with various window sizes computed in one call"""
+        windows = (30, 60, 126, 252)
+        result = ratios_module.calculate_rolling_sharpe_multi(sample_returns, windows)
+
+        assert list(result) == list(windows)
+        for window, series in result.items():
+            assert len(series) == len(sample_returns), window
+            assert series.iloc[:window - 1].isna().all(), window
+
+    def test_rolling_sharpe_multi_matches_single(self, sample_returns):
+        """Test multi-window result equals the single-window function"""
+        result = ratios_module.calculate_rolling_sharpe_multi(sample_returns, [60])
+        expected = ratios_module.calculate_rolling_sharpe(sample_returns, window=60)
+
+        pd.testing.assert_series_equal(result[60], expected)
+
+    def test_rolling_sharpe_formula(self):
+        """Test last rolling value equals Sharpe of the trailing window"""
+        returns = pd.Series([0.01, -0.02, 0.015, 0.003, -0.004, 0.02, -0.01, 0.005, 0.0, 0.012, -0.006])
+        result = ratios_module.calculate_rolling_sharpe(returns, window=10)
+
+        tail = returns.iloc[-10:]
+        expected = tail.mean() * 252 / (tail.std() * np.sqrt(252))
+        assert abs(result.iloc[-1] - expected) < 1e-9
+
+    def test_rolling_sharpe_multi_empty(self, empty_series):
+        """Test multi-window with empty series"""
+        result = ratios_module.calculate_rolling_sharpe_multi(empty_series, [30, 60])
+        assert all(series.empty for series in result.values())
 
 
 class TestSortinoRatio:
@@ -74,7 +99,7 @@ class TestSortinoRatio:
         """Test basic Sortino ratio calculation"""
         result = ratios_module.calculate_sortino_ratio(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_sortino_ratio_formula(self):
         """Test Sortino ratio uses downside deviation"""
@@ -82,7 +107,7 @@ class TestSortinoRatio:
         result = ratios_module.calculate_sortino_ratio(returns)
 
         # Sortino should handle downside volatility differently than Sharpe
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_sortino_ratio_empty(self, empty_series):
         """Test with empty series"""
@@ -103,12 +128,11 @@ class TestCalmarRatio:
         """Test basic Calmar ratio calculation"""
         result = ratios_module.calculate_calmar_ratio(sample_nav, sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_calmar_ratio_formula(self):
         """Test Calmar ratio formula: return / abs(max_drawdown)"""
-        dates = pd.date_range('2020-01-01', periods=252, freq='D')
-        nav = pd.Series(100 * (1.1 ** (np.arange(252) / 252)), index=dates)
+        nav = pd.Series(100 * (1.1 ** (np.arange(252) / 252)))
         returns = nav.pct_change(fill_method=None).dropna()
 
         result = ratios_module.calculate_calmar_ratio(nav, returns)
@@ -138,7 +162,7 @@ class TestTreynorRatio:
         beta = 1.2
         result = ratios_module.calculate_treynor_ratio(sample_returns, beta)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_treynor_ratio_formula(self):
         """Test Treynor ratio formula: (return - rf) / beta"""
@@ -150,7 +174,7 @@ class TestTreynorRatio:
 
         annual_return = 0.001 * 252
         expected = (annual_return - rf) / beta
-        assert np.isclose(result, expected)
+        assert abs(result - expected) < 1e-9
 
     def test_treynor_ratio_empty(self, empty_series):
         """Test with empty series"""
@@ -166,12 +190,22 @@ class TestTreynorRatio:
 class TestOmegaRatio:
     """Test suite for calculate_omega_ratio"""
 
-    def test_omega_ratio_basic(self, sample_returns):
+    def test_omega_ratio_basic(self, sample_returns_split):
         """Test basic Omega ratio calculation"""
-        result = ratios_module.calculate_omega_ratio(sample_returns)
+        returns, upside, downside = sample_returns_split
+        result = ratios_module.calculate_omega_ratio(returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
+        assert result == ratios_module.calculate_omega_ratio(
+            returns, split=ratios_module.ReturnSplit(upside, downside, 0.0))
+
+    def test_omega_ratio_matches_partitions(self, sample_returns_partitions):
+        """Test Omega ratio equals gains / losses at zero threshold"""
+        gains, losses, returns = sample_returns_partitions
+        result = ratios_module.calculate_omega_ratio(returns)
+
+        assert np.isclose(result, gains / losses)
 
     def test_omega_ratio_formula(self):
         """Test Omega ratio formula: gains / losses"""
@@ -186,6 +220,24 @@ class TestOmegaRatio:
 
         assert result == expected or (np.isinf(result) and np.isinf(expected))
 
+    def test_omega_ratio_threshold_split(self):
+        """Test a split taken at the threshold matches the unsplit calculation"""
+        returns = pd.Series([0.02, 0.01, -0.01, 0.015, -0.005])
+        split = ratios_module.calculate_return_split(returns, threshold=0.005)
+
+        result = ratios_module.calculate_omega_ratio(returns, threshold=0.005, split=split)
+        assert result == ratios_module.calculate_omega_ratio(returns, threshold=0.005)
+
+    def test_omega_ratio_split_threshold_mismatch(self):
+        """Test a split taken at another threshold is rejected"""
+        returns = pd.Series([0.02, 0.01, -0.01, 0.015, -0.005])
+        split = ratios_module.calculate_return_split(returns, threshold=0.005)
+
+        with pytest.raises(ValueError):
+            ratios_module.calculate_omega_ratio(returns, split=split)
+        with pytest.raises(ValueError):
+            ratios_module.calculate_gain_to_pain_ratio(returns, split=split)
+
     def test_omega_ratio_empty(self, empty_series):
         """Test with empty series"""
         result = ratios_module.calculate_omega_ratio(empty_series)
@@ -209,7 +261,7 @@ class TestM2Measure:
         """Test basic M2 measure calculation"""
         result = ratios_module.calculate_m2_measure(sample_returns, benchmark_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_m2_measure_empty(self, empty_series):
         """Test with empty series"""
@@ -225,12 +277,22 @@ class TestM2Measure:
 class TestGainToPainRatio:
     """Test suite for calculate_gain_to_pain_ratio"""
 
-    def test_gain_to_pain_basic(self, sample_returns):
+    def test_gain_to_pain_basic(self, sample_returns_split):
         """Test basic gain-to-pain ratio"""
-        result = ratios_module.calculate_gain_to_pain_ratio(sample_returns)
+        returns, upside, downside = sample_returns_split
+        result = ratios_module.calculate_gain_to_pain_ratio(returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
+        assert result == ratios_module.calculate_gain_to_pain_ratio(
+            returns, split=ratios_module.ReturnSplit(upside, downside, 0.0))
+
+    def test_gain_to_pain_matches_partitions(self, sample_returns_partitions):
+        """Test gain-to-pain ratio equals gains / losses"""
+        gains, losses, returns = sample_returns_partitions
+        result = ratios_module.calculate_gain_to_pain_ratio(returns)
+
+        assert np.isclose(result, gains / losses)
 
     def test_gain_to_pain_formula(self):
         """Test gain-to-pain formula"""
@@ -262,7 +324,7 @@ class TestUlcerPerformanceIndex:
         """Test basic UPI calculation"""
         result = ratios_module.calculate_ulcer_performance_index(sample_nav, sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_upi_empty(self, empty_series):
         """Test with empty series"""
@@ -275,25 +337,24 @@ class TestUlcerPerformanceIndex:
         result = ratios_module.calculate_ulcer_performance_index(
             sample_nav, sample_returns, window=window
         )
-        assert isinstance(result, float)
+        assert type(result) is float
+
 
+RATIO_FLOAT_CASES = (
+    (ratios_module.calculate_sharpe_ratio, ('returns',)),
+    (ratios_module.calculate_sortino_ratio, ('returns',)),
+    (ratios_module.calculate_calmar_ratio, ('nav', 'returns')),
+    (ratios_module.calculate_gain_to_pain_ratio, ('returns',)),
+)
 
-@pytest.mark.parametrize("func_name", [
-    "calculate_sharpe_ratio",
-    "calculate_sortino_ratio",
-    "calculate_calmar_ratio",
-    "calculate_gain_to_pain_ratio",
-])
-def test_ratio_functions_return_float(func_name, sample_returns, sample_nav):
-    """Parametrized test that ratio functions return float"""
-    func = getattr(ratios_module, func_name)
 
-    if func_name == "calculate_calmar_ratio":
-        result = func(sample_nav, sample_returns)
-    else:
-        result = func(sample_returns)
+def test_ratio_functions_return_float(sample_returns, sample_nav):
+    """Test that ratio functions return float"""
+    inputs = {'nav': sample_nav, 'returns': sample_returns}
 
-    assert isinstance(result, float) or np.isinf(result)
+    for func, input_names in RATIO_FLOAT_CASES:
+        result = func(*(inputs[name] for name in input_names))
+        assert type(result) is float or np.isinf(result), func.__name__
 
 
 def test_sharpe_sortino_relationship(sample_returns):
@@ -302,8 +363,8 @@ def test_sharpe_sortino_relationship(sample_returns):
     sortino = ratios_module.calculate_sortino_ratio(sample_returns)
 
     # Both should be floats
-    assert isinstance(sharpe, float)
-    assert isinstance(sortino, float)
+    assert type(sharpe) is float
+    assert type(sortino) is float
 
     # Sortino is typically >= Sharpe (since downside vol <= total vol)
     # But due to annualization and different formulas, this may not always hold
@@ -0,0 +1,181 @@
+"""Tests for returns module: P&L, trade P&L, TWR and IRR"""
+import math
+
+import pandas as pd
+import numpy as np
+from app.core.indicators import returns as returns_module
+
+
+# Two lots bought, then one sale spanning both, for the FIFO P&L check
+_FIFO_TXNS = pd.DataFrame({
+    'datetime': pd.to_datetime(['2020-01-01', '2020-02-01', '2020-03-01']),
+    'symbol': ['AAPL', 'AAPL', 'AAPL'],
+    'side': ['BUY', 'BUY', 'SELL'],
+    'quantity': np.array([100, 100, 150], dtype=np.int64),
+    'price': np.array([100.0, 110.0, 120.0]),
+    'fee': np.array([1.0, 1.0, 1.5]),
+})
+
+# Two lots, a sale spanning both, then a sale larger than the 50 shares left open
+_FIFO_PARTIAL_TXNS = pd.DataFrame({
+    'datetime': pd.to_datetime(['2020-01-01', '2020-02-01', '2020-03-01', '2020-04-01']),
+    'symbol': ['AAPL', 'AAPL', 'AAPL', 'AAPL'],
+    'side': ['BUY', 'BUY', 'SELL', 'SELL'],
+    'quantity': np.array([100, 100, 150, 100], dtype=np.int64),
+    'price': np.array([100.0, 110.0, 120.0, 130.0]),
+    'fee': np.array([1.0, 2.0, 3.0, 2.0]),
+})
+
+
+class TestPnLCalculations:
+    """Test suite for P&L calculations"""
+
+    def test_realized_pnl_basic(self, sample_transactions):
+        """Test basic realized P&L calculation"""
+        result = returns_module.calculate_realized_pnl(sample_transactions)
+
+        assert type(result) is float
+
+    def test_realized_pnl_empty(self, empty_dataframe):
+        """Test with empty transactions"""
+        result = returns_module.calculate_realized_pnl(empty_dataframe)
+        assert result == 0.0
+
+    def test_realized_pnl_none(self):
+        """Test with None transactions"""
+        result = returns_module.calculate_realized_pnl(None)
+        assert result == 0.0
+
+    def test_realized_pnl_fifo(self):
+        """Test FIFO (First In First Out) accounting"""
+        result = returns_module.calculate_realized_pnl(_FIFO_TXNS)
+
+        # First 100 shares: profit = 100 * (120 - 100) = 2000
+        # Next 50 shares: profit = 50 * (120 - 110) = 500
+        # Total before fees: 2500
+        # Fees: 1.0 + 1.0 + 1.5 = 3.5
+        expected = 2000 + 500 - 3.5
+        assert math.isclose(result, expected, rel_tol=0.01)
+
+    def test_unrealized_pnl_basic(self, sample_holdings, sample_prices_dict):
+        """Test basic unrealized P&L"""
+        result = returns_module.calculate_unrealized_pnl(sample_holdings, sample_prices_dict)
+
+        assert type(result) is float
+
+    def test_unrealized_pnl_empty(self):
+        """Test with empty holdings or prices"""
+        result = returns_module.calculate_unrealized_pnl({}, {})
+        assert result == 0.0
+
+    def test_unrealized_pnl_calculation(self):
+        """Test unrealized P&L calculation"""
+        holdings = {'AAPL': 100, 'GOOGL': 50}
+        prices = {'AAPL': 150.0, 'GOOGL': 2800.0}
+
+        result = returns_module.calculate_unrealized_pnl(holdings, prices)
+        expected = 100 * 150.0 + 50 * 2800.0
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
+
+    def test_total_pnl(self):
+        """Test total P&L calculation"""
+        realized = 1000.0
+        unrealized = 5000.0
+
+        result = returns_module.calculate_total_pnl(realized, unrealized)
+        assert result == 6000.0
+
+
+class TestTradePnL:
+    """Test suite for calculate_trade_pnl"""
+
+    def test_trade_pnl_basic(self, sample_transactions):
+        """Test basic trade P&L calculation"""
+        result = returns_module.calculate_trade_pnl(sample_transactions)
+
+        assert type(result) is pd.DataFrame
+        assert not result.empty
+        assert 'pnl' in result.columns
+        assert 'return_pct' in result.columns
+
+    def test_trade_pnl_empty(self, empty_dataframe):
+        """Test with empty transactions"""
+        result = returns_module.calculate_trade_pnl(empty_dataframe)
+        assert result.empty
+
+    def test_trade_pnl_columns(self, sample_transactions):
+        """Test that output has correct columns"""
+        result = returns_module.calculate_trade_pnl(sample_transactions)
+
+        expected_columns = ['symbol', 'buy_date', 'sell_date', 'quantity',
+                            'buy_price', 'sell_price', 'pnl', 'return_pct']
+
+        for col in expected_columns:
+            assert col in result.columns
+
+    def test_trade_pnl_fifo_partial_fills(self):
+        """Test FIFO matching across lots and a sale larger than the open position"""
+        result = returns_module.calculate_trade_pnl(_FIFO_PARTIAL_TXNS)
+
+        # Fees are prorated by matched quantity over the lot's open quantity and the sale's
+        # full quantity; the 50 unmatched shares of the second sale produce no trade.
+        # 100 @ 100 -> 120: 100 * 20 - 1 * 100/100 - 3 * 100/150
+        # 50 @ 110 -> 120:  50 * 10 - 2 * 50/100 - 3 * 50/150
+        # 50 @ 110 -> 130:  50 * 20 - 2 * 50/50 - 2 * 50/100
+        pd.testing.assert_series_equal(
+            result['buy_date'], pd.Series(pd.to_datetime(['2020-01-01', '2020-02-01', '2020-02-01']),
+                                          name='buy_date'))
+        pd.testing.assert_series_equal(
+            result['sell_date'], pd.Series(pd.to_datetime(['2020-03-01', '2020-03-01', '2020-04-01']),
+                                           name='sell_date'))
+        np.testing.assert_array_equal(result['quantity'], [100.0, 50.0, 50.0])
+        np.testing.assert_allclose(result['pnl'], [1997.0, 498.0, 997.0])
+        np.testing.assert_allclose(result['return_pct'], [0.2, 1 / 11, 2 / 11])
+
+
+class TestTWR:
+    """Test suite for Time-Weighted Return"""
+
+    def test_twr_basic(self, sample_nav):
+        """Test basic TWR calculation"""
+        result = returns_module.calculate_twr(sample_nav)
+
+        assert type(result) is float
+
+    def test_twr_no_cashflows(self, sample_nav):
+        """Test TWR without cashflows (should equal CAGR)"""
+        twr = returns_module.calculate_twr(sample_nav, cashflows=None)
+        cagr = returns_module.calculate_cagr(sample_nav)
+
+        assert math.isclose(twr, cagr, rel_tol=0.01)
+
+    def test_twr_empty(self, empty_series):
+        """Test with empty NAV"""
+        result = returns_module.calculate_twr(empty_series)
+        assert result == 0.0
+
+    def test_twr_with_cashflows(self, sample_nav, cashflows):
+        """Test TWR with cashflows"""
+        result = returns_module.calculate_twr(sample_nav, cashflows=cashflows)
+
+        assert type(result) is float
+
+
+class TestIRR:
+    """Test suite for Internal Rate of Return"""
+
+    def test_irr_basic(self, cashflows):
+        """Test basic IRR calculation"""
+        result = returns_module.calculate_irr(cashflows)
+
+        assert type(result) is float
+
+    def test_irr_empty(self, empty_dataframe):
+        """Test with empty cashflows"""
+        result = returns_module.calculate_irr(empty_dataframe)
+        assert result == 0.0
+
+    def test_irr_none(self):
+        """Test with None cashflows"""
+        result = returns_module.calculate_irr(None)
+        assert result == 0.0
@@ -1,32 +1,36 @@
 """Tests for risk module"""
+import math
+
 import pytest
 import pandas as pd
 import numpy as np
 from app.core.indicators import risk as risk_module
 
 
+SQRT_252 = math.sqrt(252)
+
+# Small mixed-sign path shared by the volatility formula tests, with its sample std
+_RETURNS_MIXED = pd.Series([0.01, 0.02, -0.01, 0.015, -0.005])
+_RETURNS_MIXED_STD = float(_RETURNS_MIXED.std())
+
+
 class TestDailyVolatility:
     """Test suite for calculate_daily_volatility"""
 
+    @pytest.mark.smoke
     def test_daily_volatility_basic(self, sample_returns):
         """Test basic daily volatility calculation"""
         result = risk_module.calculate_daily_volatility(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_daily_volatility_formula(self):
         """Test that volatility is standard deviation"""
-        returns = pd.Series([0.01, 0.02, -0.01, 0.015, -0.005])
-        result = risk_module.calculate_daily_volatility(returns)
-
-        expected = returns.std()
-        assert np.isclose(result, expected)
+        result = risk_module.calculate_daily_volatility(_RETURNS_MIXED)
 
-    def test_daily_volatility_empty(self, empty_series):
-        """Test with empty series"""
-        result = risk_module.calculate_daily_volatility(empty_series)
-        assert result == 0.0
+        expected = _RETURNS_MIXED_STD
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
 
     def test_daily_volatility_constant(self, zero_returns):
         """Test with constant returns (zero volatility)"""
@@ -41,86 +45,80 @@ class TestAnnualizedVolatility:
         """Test basic annualized volatility"""
         result = risk_module.calculate_annualized_volatility(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
+        # Annualized should be daily * sqrt(252)
+        daily_vol = risk_module.calculate_daily_volatility(sample_returns)
+        assert math.isclose(result, daily_vol * SQRT_252, rel_tol=0.01)
 
     def test_annualized_volatility_formula(self):
         """Test annualization formula: daily_vol * sqrt(252)"""
-        returns = pd.Series([0.01, 0.02, -0.01, 0.015, -0.005])
-        result = risk_module.calculate_annualized_volatility(returns, periods_per_year=252)
-
-        daily_vol = returns.std()
-        expected = daily_vol * np.sqrt(252)
-        assert np.isclose(result, expected)
+        result = risk_module.calculate_annualized_volatility(_RETURNS_MIXED, periods_per_year=252)
 
-    def test_annualized_volatility_empty(self, empty_series):
-        """Test with empty series"""
-        result = risk_module.calculate_annualized_volatility(empty_series)
-        assert result == 0.0
+        expected = _RETURNS_MIXED_STD * SQRT_252
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
 
     def test_annualized_volatility_custom_periods(self):
         """Test with custom periods per year"""
-        returns = pd.Series([0.01] * 100)
+        returns = pd.Series(np.full(100, 0.01))
         result = risk_module.calculate_annualized_volatility(returns, periods_per_year=12)
 
         daily_vol = returns.std()
         expected = daily_vol * np.sqrt(12)
-        assert np.isclose(result, expected)
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
 
 
 class TestRollingVolatility:
     """Test suite for calculate_rolling_volatility"""
 
+    @pytest.mark.smoke
     def test_rolling_volatility_basic(self, sample_returns):
         """Test basic rolling volatility"""
         result = risk_module.calculate_rolling_volatility(sample_returns, window=21)
 
-        assert isinstance(result, pd.Series)
+        assert type(result) is pd.Series
         assert len(result) == len(sample_returns)
 
     def test_rolling_volatility_annualized(self, sample_returns):
         """Test rolling volatility with annualization"""
         result = risk_module.calculate_rolling_volatility(sample_returns, window=21, annualize=True)
 
-        # Check that values are scaled by sqrt(252)
-        result_not_ann = risk_module.calculate_rolling_volatility(sample_returns, window=21, annualize=False)
-
-        # Non-NaN values should differ by factor of sqrt(252)
-        valid_idx = ~result.isna() & ~result_not_ann.isna()
-        if valid_idx.any():
-            ratio = result[valid_idx] / result_not_ann[valid_idx]
-            assert np.allclose(ratio, np.sqrt(252), rtol=0.01)
+        # Non-NaN values should be the plain rolling std scaled by sqrt(252)
+        valid = result.notna().to_numpy()
+        ratio = result.to_numpy()[valid] / sample_returns.rolling(window=21).std().to_numpy()[valid]
+        assert valid.any()
+        np.testing.assert_allclose(ratio, SQRT_252, rtol=0.01)
 
     def test_rolling_volatility_empty(self, empty_series):
         """Test with empty series"""
         result = risk_module.calculate_rolling_volatility(empty_series, window=21)
         assert result.empty
 
-    @pytest.mark.parametrize("window", [5, 10, 20, 50, 100])
-    def test_rolling_volatility_windows(self, sample_returns, window):
+    def test_rolling_volatility_windows(self, sample_returns):
         """Test with various window sizes"""
-        result = risk_module.calculate_rolling_volatility(sample_returns, window=window)
-
-        assert len(result) == len(sample_returns)
+        for window in (5, 10, 20, 50, 100):
+            result = risk_module.calculate_rolling_volatility(sample_returns, window=window)
+            assert len(result) == len(sample_returns), window
 
 
 class TestUpsideVolatility:
     """Test suite for calculate_upside_volatility"""
 
+    @pytest.mark.smoke
     def test_upside_volatility_basic(self, sample_returns):
         """Test basic upside volatility"""
         result = risk_module.calculate_upside_volatility(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
-    def test_upside_volatility_only_positive(self, positive_returns):
+    def test_upside_volatility_only_positive(self, positive_returns_volatility):
         """Test upside volatility with only positive returns"""
-        result = risk_module.calculate_upside_volatility(positive_returns)
+        expected_vol, returns = positive_returns_volatility
+        result = risk_module.calculate_upside_volatility(returns)
 
         # Should equal annualized volatility of all returns
-        expected_vol = positive_returns.std() * np.sqrt(252)
-        assert np.isclose(result, expected_vol, rtol=0.01)
+        assert math.isclose(result, expected_vol, rel_tol=0.01)
 
     def test_upside_volatility_only_negative(self, negative_returns):
         """Test upside volatility with only negative returns"""
@@ -129,37 +127,33 @@ class TestUpsideVolatility:
         # No positive returns, should be 0
         assert result == 0.0
 
-    def test_upside_volatility_empty(self, empty_series):
-        """Test with empty series"""
-        result = risk_module.calculate_upside_volatility(empty_series)
-        assert result == 0.0
-
-    def test_upside_volatility_no_annualize(self, sample_returns):
+    def test_upside_volatility_no_annualize(self, sample_returns_split):
         """Test without annualization"""
-        result = risk_module.calculate_upside_volatility(sample_returns, annualize=False)
+        returns, upside, _ = sample_returns_split
+        result = risk_module.calculate_upside_volatility(returns, annualize=False)
 
-        upside_returns = sample_returns[sample_returns > 0]
-        expected = upside_returns.std() if not upside_returns.empty else 0.0
-        assert np.isclose(result, expected, rtol=0.01)
+        expected = upside.std(ddof=1) if upside.size else 0.0
+        assert math.isclose(result, expected, rel_tol=0.01)
 
 
 class TestDownsideVolatility:
     """Test suite for calculate_downside_volatility"""
 
+    @pytest.mark.smoke
     def test_downside_volatility_basic(self, sample_returns):
         """Test basic downside volatility"""
         result = risk_module.calculate_downside_volatility(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
-    def test_downside_volatility_only_negative(self, negative_returns):
+    def test_downside_volatility_only_negative(self, negative_returns_volatility):
         """Test downside volatility with only negative returns"""
-        result = risk_module.calculate_downside_volatility(negative_returns)
+        expected_vol, returns = negative_returns_volatility
+        result = risk_module.calculate_downside_volatility(returns)
 
         # Should equal annualized volatility of all returns
-        expected_vol = negative_returns.std() * np.sqrt(252)
-        assert np.isclose(result, expected_vol, rtol=0.01)
+        assert math.isclose(result, expected_vol, rel_tol=0.01)
 
     def test_downside_volatility_only_positive(self, positive_returns):
         """Test downside volatility with only positive returns"""
@@ -168,10 +162,13 @@ class TestDownsideVolatility:
         # No negative returns, should be 0
         assert result == 0.0
 
-    def test_downside_volatility_empty(self, empty_series):
-        """Test with empty series"""
-        result = risk_module.calculate_downside_volatility(empty_series)
-        assert result == 0.0
+    def test_downside_volatility_no_annualize(self, sample_returns_split):
+        """Test without annualization"""
+        returns, _, downside = sample_returns_split
+        result = risk_module.calculate_downside_volatility(returns, annualize=False)
+
+        expected = downside.std(ddof=1) if downside.size else 0.0
+        assert math.isclose(result, expected, rel_tol=0.01)
 
     def test_downside_volatility_custom_target(self):
         """Test with custom target return"""
@@ -181,18 +178,19 @@ class TestDownsideVolatility:
         result = risk_module.calculate_downside_volatility(returns, target_return=target)
 
         downside = returns[returns < target]
-        expected = downside.std() * np.sqrt(252)
-        assert np.isclose(result, expected, rtol=0.01)
+        expected = downside.std() * SQRT_252
+        assert math.isclose(result, expected, rel_tol=0.01)
 
 
 class TestSemivariance:
     """Test suite for calculate_semivariance"""
 
+    @pytest.mark.smoke
     def test_semivariance_basic(self, sample_returns):
         """Test basic semivariance calculation"""
         result = risk_module.calculate_semivariance(sample_returns)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_semivariance_formula(self):
@@ -204,12 +202,7 @@ class TestSemivariance:
 
         downside = returns[returns < target]
         expected = (downside ** 2).mean()
-        assert np.isclose(result, expected)
-
-    def test_semivariance_empty(self, empty_series):
-        """Test with empty series"""
-        result = risk_module.calculate_semivariance(empty_series)
-        assert result == 0.0
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
 
     def test_semivariance_no_downside(self, positive_returns):
         """Test with no downside returns"""
@@ -221,7 +214,7 @@ class TestSemivariance:
         result = risk_module.calculate_semivariance(negative_returns)
 
         expected = (negative_returns ** 2).mean()
-        assert np.isclose(result, expected)
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
 
     def test_semivariance_custom_target(self):
         """Test with custom target return"""
@@ -232,29 +225,26 @@ class TestSemivariance:
 
         downside = returns[returns < target]
         expected = (downside ** 2).mean()
-        assert np.isclose(result, expected)
+        assert math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-8)
 
 
-@pytest.mark.parametrize("func_name,expected_range", [
-    ("calculate_daily_volatility", (0, float('inf'))),
-    ("calculate_annualized_volatility", (0, float('inf'))),
-    ("calculate_upside_volatility", (0, float('inf'))),
-    ("calculate_downside_volatility", (0, float('inf'))),
-    ("calculate_semivariance", (0, float('inf'))),
-])
-def test_risk_functions_non_negative(func_name, expected_range, sample_returns):
-    """Parametrized test that risk measures are non-negative"""
-    func = getattr(risk_module, func_name)
-    result = func(sample_returns)
+RISK_SCALAR_CASES = (
+    risk_module.calculate_daily_volatility,
+    risk_module.calculate_annualized_volatility,
+    risk_module.calculate_upside_volatility,
+    risk_module.calculate_downside_volatility,
+    risk_module.calculate_semivariance,
+)
 
-    assert result >= expected_range[0]
 
+def test_risk_functions_empty(subtests, empty_series):
+    """Test that every scalar risk measure returns 0.0 for empty input"""
+    for func in RISK_SCALAR_CASES:
+        with subtests.test(func=func.__name__):
+            assert func(empty_series) == 0.0
 
-def test_volatility_relationship(sample_returns):
-    """Test relationship between different volatility measures"""
-    daily_vol = risk_module.calculate_daily_volatility(sample_returns)
-    annual_vol = risk_module.calculate_annualized_volatility(sample_returns)
 
-    # Annualized should be daily * sqrt(252)
-    expected_annual = daily_vol * np.sqrt(252)
-    assert np.isclose(annual_vol, expected_annual, rtol=0.01)
+def test_risk_functions_non_negative(sample_returns):
+    """Test that risk measures are non-negative"""
+    for func in RISK_SCALAR_CASES:
+        assert func(sample_returns) >= 0, func.__name__
@@ -1,8 +1,21 @@
 """Tests for trading module"""
+import math
+
 import pytest
 import pandas as pd
 import numpy as np
 from app.core.indicators import trading as trading_module
+from app.core.indicators.returns import calculate_trade_pnl
+
+# One lot sold in six pieces with no fees: +1000, +1000, -1000, +1000, +1000, +1000
+_STREAK_TXNS = pd.DataFrame({
+    'datetime': pd.date_range('2020-01-01', periods=7, freq='D'),
+    'symbol': ['AAPL'] * 7,
+    'side': ['BUY'] + ['SELL'] * 6,
+    'quantity': np.array([600, 100, 100, 100, 100, 100, 100], dtype=np.int64),
+    'price': np.array([100.0, 110.0, 110.0, 90.0, 110.0, 110.0, 110.0]),
+    'fee': np.zeros(7),
+})
 
 
 class TestTradeCount:
@@ -12,7 +25,7 @@ class TestTradeCount:
         """Test basic trade count"""
         result = trading_module.calculate_trade_count(sample_transactions)
 
-        assert isinstance(result, int)
+        assert type(result) is int
         assert result >= 0
 
     def test_trade_count_empty(self, empty_dataframe):
@@ -37,6 +50,16 @@ class TestTradeCount:
         # 2 buys, 1 sell -> min(2, 1) = 1
         assert result == 1
 
+    def test_trade_count_mixed_case_sides(self):
+        """Test that side matching is case-insensitive and ignores other sides"""
+        txns = pd.DataFrame({
+            'symbol': ['AAPL', 'AAPL', 'AAPL', 'AAPL', 'AAPL'],
+            'side': ['buy', 'Buy', 'sell', 'SELL', 'DIVIDEND'],
+        })
+
+        result = trading_module.calculate_trade_count(txns)
+        assert result == 2
+
 
 class TestTurnoverRate:
     """Test suite for calculate_turnover_rate"""
@@ -45,7 +68,7 @@ class TestTurnoverRate:
         """Test basic turnover rate"""
         result = trading_module.calculate_turnover_rate(sample_transactions, sample_nav)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_turnover_rate_empty(self, empty_dataframe, sample_nav):
@@ -58,6 +81,20 @@ class TestTurnoverRate:
         result = trading_module.calculate_turnover_rate(None, sample_nav)
         assert result == 0.0
 
+    def test_turnover_rate_formula(self, date_indices):
+        """Test turnover = sum(|qty * price|) / mean(nav) * 365 / days"""
+        txns = pd.DataFrame({
+            'symbol': ['AAPL', 'AAPL', 'AAPL'],
+            'side': ['BUY', 'sell', 'DIVIDEND'],
+            'quantity': np.array([10, 10, 10], dtype=np.int64),
+            'price': np.array([100.0, 110.0, 5.0]),
+        })
+        nav = pd.Series(1000.0, index=date_indices[:366])  # 365 days
+
+        result = trading_module.calculate_turnover_rate(txns, nav)
+        # (10 * 100 + 10 * 110) / 1000, dividend row excluded
+        assert math.isclose(result, 2.1, rel_tol=1e-12)
+
 
 class TestTurnoverRateByAsset:
     """Test suite for calculate_turnover_rate_by_asset"""
@@ -68,13 +105,29 @@ class TestTurnoverRateByAsset:
             sample_transactions, sample_nav
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
 
     def test_turnover_by_asset_empty(self, empty_dataframe, sample_nav):
         """Test with empty transactions"""
         result = trading_module.calculate_turnover_rate_by_asset(empty_dataframe, sample_nav)
         assert result == {}
 
+    def test_turnover_by_asset_formula(self, date_indices):
+        """Test per-symbol turnover in first-seen symbol order"""
+        txns = pd.DataFrame({
+            'symbol': ['MSFT', 'AAPL', 'MSFT', 'AAPL'],
+            'side': ['BUY', 'BUY', 'SELL', 'DIVIDEND'],
+            'quantity': np.array([5, 10, 5, 10], dtype=np.int64),
+            'price': np.array([200.0, 100.0, 220.0, 5.0]),
+        })
+        nav = pd.Series(1000.0, index=date_indices[:366])  # 365 days
+
+        result = trading_module.calculate_turnover_rate_by_asset(txns, nav)
+
+        assert list(result) == ['MSFT', 'AAPL']
+        assert math.isclose(result['MSFT'], 2.1, rel_tol=1e-12)
+        assert math.isclose(result['AAPL'], 1.0, rel_tol=1e-12)
+
 
 class TestAvgHoldingPeriod:
     """Test suite for calculate_avg_holding_period"""
@@ -83,7 +136,7 @@ class TestAvgHoldingPeriod:
         """Test basic average holding period"""
         result = trading_module.calculate_avg_holding_period(sample_transactions)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_avg_holding_period_empty(self, empty_dataframe):
@@ -91,6 +144,12 @@ class TestAvgHoldingPeriod:
         result = trading_module.calculate_avg_holding_period(empty_dataframe)
         assert result == 0.0
 
+    def test_avg_holding_period_formula(self):
+        """Test average holding period in whole days"""
+        result = trading_module.calculate_avg_holding_period(_STREAK_TXNS)
+        # Sells one to six days after the single buy
+        assert result == 3.5
+
 
 class TestWinRate:
     """Test suite for calculate_win_rate"""
@@ -99,7 +158,7 @@ class TestWinRate:
         """Test basic win rate"""
         result = trading_module.calculate_win_rate(sample_transactions)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert 0.0 <= result <= 1.0
 
     def test_win_rate_empty(self, empty_dataframe):
@@ -127,7 +186,7 @@ class TestProfitLossRatio:
         """Test basic profit/loss ratio"""
         result = trading_module.calculate_profit_loss_ratio(sample_transactions)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_pl_ratio_empty(self, empty_dataframe):
@@ -143,13 +202,13 @@ class TestMaxTradeProfitLoss:
         """Test basic max trade profit"""
         result = trading_module.calculate_max_trade_profit(sample_transactions)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_max_trade_loss_basic(self, sample_transactions):
         """Test basic max trade loss"""
         result = trading_module.calculate_max_trade_loss(sample_transactions)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_max_trade_profit_empty(self, empty_dataframe):
         """Test with empty transactions"""
@@ -169,14 +228,14 @@ class TestConsecutiveTrades:
         """Test basic consecutive winning trades"""
         result = trading_module.calculate_consecutive_winning_trades(sample_transactions)
 
-        assert isinstance(result, int)
+        assert type(result) is int
         assert result >= 0
 
     def test_consecutive_losing_basic(self, sample_transactions):
         """Test basic consecutive losing trades"""
         result = trading_module.calculate_consecutive_losing_trades(sample_transactions)
 
-        assert isinstance(result, int)
+        assert type(result) is int
         assert result >= 0
 
     def test_consecutive_winning_empty(self, empty_dataframe):
@@ -189,6 +248,11 @@ class TestConsecutiveTrades:
         result = trading_module.calculate_consecutive_losing_trades(empty_dataframe)
         assert result == 0
 
+    def test_consecutive_runs_formula(self):
+        """Test longest win and loss runs on a known trade sequence"""
+        assert trading_module.calculate_consecutive_winning_trades(_STREAK_TXNS) == 3
+        assert trading_module.calculate_consecutive_losing_trades(_STREAK_TXNS) == 1
+
 
 class TestProfitFactor:
     """Test suite for calculate_profit_factor"""
@@ -197,7 +261,7 @@ class TestProfitFactor:
         """Test basic profit factor"""
         result = trading_module.calculate_profit_factor(sample_transactions)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert result >= 0
 
     def test_profit_factor_empty(self, empty_dataframe):
@@ -217,6 +281,12 @@ class TestProfitFactor:
         result = trading_module.calculate_profit_factor(txns)
         assert np.isinf(result)
 
+    def test_profit_factor_formula(self):
+        """Test profit factor = gross profit / abs(gross loss)"""
+        result = trading_module.calculate_profit_factor(_STREAK_TXNS)
+        # 5 wins of 1000 against 1 loss of 1000
+        assert math.isclose(result, 5.0, rel_tol=1e-12)
+
 
 class TestRecoveryFactor:
     """Test suite for calculate_recovery_factor"""
@@ -225,13 +295,21 @@ class TestRecoveryFactor:
         """Test basic recovery factor"""
         result = trading_module.calculate_recovery_factor(sample_nav)
 
-        assert isinstance(result, float)
+        assert type(result) is float
 
     def test_recovery_factor_empty(self, empty_series):
         """Test with empty NAV"""
         result = trading_module.calculate_recovery_factor(empty_series)
         assert result == 0.0
 
+    def test_recovery_factor_formula(self, date_indices):
+        """Test recovery factor = net profit / abs(max drawdown)"""
+        nav = pd.Series(np.array([100.0, 120.0, 90.0, 130.0]), index=date_indices[:4])
+
+        result = trading_module.calculate_recovery_factor(nav)
+        # net profit 0.30, max drawdown 90 / 120 - 1 = -0.25
+        assert math.isclose(result, 1.2, rel_tol=1e-12)
+
 
 class TestKellyCriterion:
     """Test suite for calculate_kelly_criterion"""
@@ -243,7 +321,7 @@ class TestKellyCriterion:
 
         result = trading_module.calculate_kelly_criterion(win_rate, pl_ratio)
 
-        assert isinstance(result, float)
+        assert type(result) is float
         assert 0 <= result <= 1.0
 
     def test_kelly_formula(self):
@@ -274,7 +352,7 @@ class TestAllTradingMetrics:
             sample_transactions, sample_nav
         )
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert 'trade_count' in result
         assert 'turnover_rate' in result
         assert 'win_rate' in result
@@ -285,7 +363,7 @@ class TestAllTradingMetrics:
         """Test with empty transactions"""
         result = trading_module.calculate_all_trading_metrics(empty_dataframe, sample_nav)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert result['trade_count'] == 0
         assert result['win_rate'] == 0.0
 
@@ -293,9 +371,42 @@ class TestAllTradingMetrics:
         """Test with None transactions"""
         result = trading_module.calculate_all_trading_metrics(None, sample_nav)
 
-        assert isinstance(result, dict)
+        assert type(result) is dict
         assert result['trade_count'] == 0
 
+    def test_all_metrics_known_trades(self, sample_nav):
+        """Test trade-level metrics on a known win/loss sequence"""
+        result = trading_module.calculate_all_trading_metrics(_STREAK_TXNS, sample_nav)
+
+        assert math.isclose(result['win_rate'], 5 / 6, rel_tol=1e-12)
+        assert math.isclose(result['profit_loss_ratio'], 1.0, rel_tol=1e-12)
+        assert math.isclose(result['profit_factor'], 5.0, rel_tol=1e-12)
+        assert math.isclose(result['max_trade_profit'], 1000.0, rel_tol=1e-12)
+        assert math.isclose(result['max_trade_loss'], -1000.0, rel_tol=1e-12)
+        assert result['avg_holding_period'] == 3.5
+        assert result['consecutive_winning_trades'] == 3
+        assert result['consecutive_losing_trades'] == 1
+
+
+TRADE_PNL_CASES = (
+    trading_module.calculate_avg_holding_period,
+    trading_module.calculate_win_rate,
+    trading_module.calculate_profit_loss_ratio,
+    trading_module.calculate_profit_factor,
+    trading_module.calculate_max_trade_profit,
+    trading_module.calculate_max_trade_loss,
+    trading_module.calculate_consecutive_winning_trades,
+    trading_module.calculate_consecutive_losing_trades,
+)
+
+
+def test_shared_trades_same_results(sample_transactions):
+    """Test every trade-level metric gives the same result with precomputed trades"""
+    trades = calculate_trade_pnl(sample_transactions)
+
+    for func in TRADE_PNL_CASES:
+        assert func(sample_transactions, trades=trades) == func(sample_transactions), func.__name__
+
 
 @pytest.mark.parametrize("func_name", [
     "calculate_trade_count",
@@ -306,4 +417,4 @@ def test_trading_functions_return_int(func_name, sample_transactions):
     """Parametrized test that counting functions return int"""
     func = getattr(trading_module, func_name)
     result = func(sample_transactions)
-    assert isinstance(result, int)
+    assert type(result) is int
@@ -1,8 +1,7 @@
 """Tests for utils module"""
-import pytest
 import pandas as pd
 import numpy as np
-from app.core.indicators.utils import rolling_normalize
+from app.core.indicators.utils import longest_run, rolling_normalize, rolling_normalize_frame, run_bounds
 
 
 class TestRollingNormalize:
@@ -12,16 +11,17 @@ class TestRollingNormalize:
         """Test basic rolling normalization"""
         result = rolling_normalize(sample_prices, window=21)
 
-        assert isinstance(result, pd.Series)
+        assert type(result) is pd.Series
         assert len(result) == len(sample_prices)
         assert not result.isna().any()
 
     def test_rolling_normalize_window_size(self, sample_prices):
         """Test different window sizes"""
-        for window in [5, 10, 20, 50]:
+        for window in (2, 5, 10, 20, 21, 50, 100):
             result = rolling_normalize(sample_prices, window=window)
-            assert len(result) == len(sample_prices)
-            assert not result.isna().any()
+            assert type(result) is pd.Series, window
+            assert len(result) == len(sample_prices), window
+            assert not result.isna().any(), window
 
     def test_rolling_normalize_empty_series(self, empty_series):
         """Test with empty series"""
@@ -35,9 +35,9 @@ class TestRollingNormalize:
         # With single value, std is 0, so normalized value should be 0 (due to eps)
         assert abs(result.iloc[0]) < 1e-6
 
-    def test_rolling_normalize_constant_series(self):
+    def test_rolling_normalize_constant_series(self, date_indices):
         """Test with constant values (zero variance)"""
-        dates = pd.date_range(start='2020-01-01', periods=100, freq='D')
+        dates = date_indices[:100]
         constant = pd.Series(100.0, index=dates)
 
         result = rolling_normalize(constant, window=21)
@@ -60,9 +60,9 @@ class TestRollingNormalize:
         # Std should be close to 1
         assert abs(rolling_std.mean() - 1.0) < 0.5
 
-    def test_rolling_normalize_no_nan_propagation(self):
+    def test_rolling_normalize_no_nan_propagation(self, date_indices):
         """Test that forward and backward fill handle edge cases"""
-        dates = pd.date_range(start='2020-01-01', periods=50, freq='D')
+        dates = date_indices[:50]
         series = pd.Series(range(50), index=dates, dtype=float)
 
         result = rolling_normalize(series, window=10)
@@ -70,26 +70,38 @@ class TestRollingNormalize:
         # Should have no NaN values
         assert not result.isna().any()
 
+    def test_rolling_normalize_first_point_zero(self, sample_prices):
+        """Test that points with a single observation in the window normalize to 0"""
+        result = rolling_normalize(sample_prices, window=21)
+        assert result.iloc[0] == 0.0
+
+        # window=1 never has two observations, so every point is 0
+        assert (rolling_normalize(sample_prices, window=1) == 0.0).all()
+
+    def test_rolling_normalize_fill_nan(self, date_indices):
+        """Test that NaN inputs are filled by default and kept with fill_nan=False"""
+        dates = date_indices[:50]
+        series = pd.Series(np.arange(50, dtype=np.float64), index=dates)
+        series.iloc[[10, 30]] = np.nan
+
+        filled = rolling_normalize(series, window=10)
+        kept = rolling_normalize(series, window=10, fill_nan=False)
+
+        assert not filled.isna().any()
+        assert filled.iloc[10] == filled.iloc[9]
+        assert kept.isna().sum() == 2
+        assert kept.iloc[[10, 30]].isna().all()
+
     def test_rolling_normalize_preserves_index(self, sample_prices):
         """Test that index is preserved"""
         result = rolling_normalize(sample_prices, window=21)
 
         assert result.index.equals(sample_prices.index)
 
-    @pytest.mark.parametrize("window", [2, 5, 10, 21, 50, 100])
-    def test_rolling_normalize_various_windows(self, sample_prices, window):
-        """Test with various window sizes"""
-        result = rolling_normalize(sample_prices, window=window)
-
-        assert isinstance(result, pd.Series)
-        assert len(result) == len(sample_prices)
-        assert not result.isna().any()
-
-    def test_rolling_normalize_with_negative_values(self):
+    def test_rolling_normalize_with_negative_values(self, rng, date_indices):
         """Test with series containing negative values"""
-        dates = pd.date_range(start='2020-01-01', periods=100, freq='D')
-        np.random.seed(42)
-        series = pd.Series(np.random.randn(100) * 50 - 25, index=dates)
+        dates = date_indices[:100]
+        series = pd.Series(rng.standard_normal(100) * 50 - 25, index=dates)
 
         result = rolling_normalize(series, window=20)
 
@@ -104,3 +116,45 @@ class TestRollingNormalize:
         # Should still work with min_periods=1
         assert len(result) == len(sample_prices)
         assert not result.isna().any()
+
+
+class TestRollingNormalizeFrame:
+    """Test suite for rolling_normalize_frame function"""
+
+    def test_rolling_normalize_frame_matches_columns(self, sample_price_history):
+        """Test each column matches rolling_normalize on that column"""
+        prices = sample_price_history.copy()
+        prices.iloc[[0, 40], 1] = np.nan
+
+        for fill_nan in (True, False):
+            result = rolling_normalize_frame(prices, window=21, fill_nan=fill_nan)
+
+            assert result.index.equals(prices.index)
+            assert list(result.columns) == list(prices.columns)
+            for col in prices.columns:
+                pd.testing.assert_series_equal(
+                    result[col], rolling_normalize(prices[col], window=21, fill_nan=fill_nan)
+                )
+
+    def test_rolling_normalize_frame_empty(self, empty_dataframe):
+        """Test with empty DataFrame"""
+        result = rolling_normalize_frame(empty_dataframe, window=21)
+        assert result.empty
+
+
+class TestRuns:
+    """Test suite for run_bounds and longest_run"""
+
+    def test_run_bounds_formula(self):
+        """Test start and length of each True run"""
+        mask = np.array([True, True, False, True, False, False, True, True, True])
+        starts, lengths = run_bounds(mask)
+
+        np.testing.assert_array_equal(starts, [0, 3, 6])
+        np.testing.assert_array_equal(lengths, [2, 1, 3])
+        assert longest_run(mask) == 3
+
+    def test_longest_run_no_true(self):
+        """Test an all-False or empty mask has no run"""
+        assert longest_run(np.zeros(5, dtype=bool)) == 0
+        assert longest_run(np.array([], dtype=bool)) == 0